@@ -3,6 +3,7 @@
 import numpy as np
 import csv
 import random
+import argparse
 
 #도시 클래스
 class city:
@@ -22,27 +23,25 @@ class tour:
         self.cities_order = []
         
     #cities 배열 생성
+    #시작 도시 뒤에 나머지 도시를 한 번에 섞어 넣고, TSP이기 때문에 마지막으로 시작도시를 넣어준다.
     def makeOrder(self):
-        copy_cities = cities.copy();
-        #valid_index = len(cities)
-        next_index = 0
-        start_city = copy_cities[0]
-        self.cities_order.append(copy_cities[next_index]) #시작 도시를 먼저 삽입후 시작
-        del copy_cities[next_index]
-        
-        for i in range(len(copy_cities)):
-            next_index = random.randint(0,len(copy_cities)-1)#copy_cities에서 랜덤 인덱스값 받아오기
-            #print(next_index)
-            self.cities_order.append(copy_cities[next_index]) 
-            del copy_cities[next_index]
-            
-            pre_city = self.cities_order[i]
-            post_city = self.cities_order[i+1]
-            self.total_length = self.total_length + pre_city.getDistance(post_city)
-        
-        #1000개의 배열이 끝난뒤 TSP이기 때문에 마지막으로 시작도시를 넣어준다.       
-        self.cities_order.append(start_city)
-        self.total_length = self.total_length + pre_city.getDistance(start_city)
+        order = np.concatenate(([0], np.random.permutation(np.arange(1, len(self.cities)))))
+        xy = np.array([[float(c.x), float(c.y)] for c in self.cities])[order]
+        diff = xy - np.roll(xy, -1, axis=0)
+        self.total_length = float(np.hypot(diff[:, 0], diff[:, 1]).sum())
+        self.cities_order = [self.cities[i] for i in order.tolist()]
+        self.cities_order.append(self.cities[0])
+
+#명령행 옵션, 부모 gene 수를 주지 않으면 input() 으로 묻는다
+parser = argparse.ArgumentParser(description='Random tours')
+parser.add_argument('--cities', default='../TSP.csv', help='CSV city file')
+parser.add_argument('--population', type=int, default=None, help='number of random tours')
+parser.add_argument('--seed', type=int, default=None, help='seed for random')
+parser.add_argument('--output', default='sample.csv', help='CSV file for the first tour')
+args = parser.parse_args()
+if args.seed is not None:
+    random.seed(args.seed)
+    np.random.seed(args.seed)
 
 cities = []
 new_cities = []
@@ -51,7 +50,7 @@ parentGene = []
 
 i = 0
 #csv값들을 받아 도시 클래스 배열에 대입
-with open('../TSP.csv', mode='r', newline='') as tsp:
+with open(args.cities, mode='r', newline='') as tsp:
     reader = csv.reader(tsp)
     i = 0
     for row in reader:
@@ -63,7 +62,9 @@ with open('../TSP.csv', mode='r', newline='') as tsp:
         i = i +1
         '''
         
-number = int(input("생성할 부모 gene 수를 입력하시오 :  "))
+number = args.population
+if number is None:
+    number = int(input("생성할 부모 gene 수를 입력하시오 :  "))
 for i in range(number):
     tournode = tour(cities)
     tournode.makeOrder() 
@@ -75,7 +76,7 @@ for i in range(number):
     print(len(parentGene[0].cities_order))
     print(last)
 
-with open('sample.csv', mode = 'w', newline='') as sam:
+with open(args.output, mode = 'w', newline='') as sam:
     writer = csv.writer(sam)
     index_array = []
     for row in range(len(parentGene[0].cities_order)):
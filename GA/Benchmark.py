@@ -0,0 +1,230 @@
+# 성능 측정
+# 균일 / 군집 분포의 합성 도시(100 ~ 100000 개)에서 교차, 변이, 선택, dfs.tour 생성,
+# evolvePopulation 한 세대의 시간과 최대 메모리(tracemalloc)를 재서 JSON 으로 저장
+# 커밋끼리 비교: python Benchmark.py --output new.json --compare old.json
+
+import io
+import os
+import contextlib
+import json
+import time
+import random
+import platform
+import argparse
+import subprocess
+import tracemalloc
+import numpy as np
+from City import City
+from City import TourManager
+from City import Tour
+from City import Population
+from GA_Random import GA
+from Spatial import GridIndex
+from Seeding import hilbertOrder
+from Seeding import nearestNeighborOrder
+from Seeding import greedyOrder
+import dfs
+
+SIZES = [100, 1000, 10000, 100000]
+KINDS = ['uniform', 'clustered']
+
+# O(n^2) 인 연산은 이 도시 수까지만 잰다
+QUADRATIC_LIMIT = 5000
+
+
+# [0, 100) 균일 분포 좌표
+def uniformCities(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 2)) * 100
+
+
+# 중심 sqrt(n)/2 개 주변에 정규 분포로 모인 좌표
+def clusteredCities(n, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.random((max(1, int(np.sqrt(n) / 2)), 2)) * 100
+    labels = rng.integers(0, len(centers), size=n)
+    return np.clip(centers[labels] + rng.normal(0, 2.0, (n, 2)), 0, 100)
+
+
+def makeCities(kind, n, seed=0):
+    if kind == 'uniform':
+        return uniformCities(n, seed)
+    if kind == 'clustered':
+        return clusteredCities(n, seed)
+    raise ValueError('unknown instance kind: ' + kind)
+
+
+# 좌표로 TourManager 만들기 (City.index 는 0 부터)
+def makeTourManager(coordinates, dtype=np.float64):
+    tourmanager = TourManager(dtype)
+    tourmanager.setCity([City(x, y, i) for i, (x, y) in enumerate(coordinates.tolist())])
+    tourmanager.coordinates = coordinates
+    # 거리 행렬과 이웃 목록은 처음 쓸 때 만들어지므로 미리 만들어 첫 측정에 들어가지 않게 한다
+    if tourmanager.useMatrix():
+        tourmanager.buildDistanceMatrix()
+    tourmanager.getNeighbors(8)
+    return tourmanager
+
+
+# 도시 0 에서 시작하는 랜덤 여행 populationSize 개
+def randomPopulation(tourmanager, populationSize, rng):
+    return Population(tourmanager, populationSize, False).randomize(rng)
+
+
+# fn 을 repeat 번 실행한 시간 (초) 과 한 번 실행의 최대 메모리 (byte)
+# setup 은 매번 새 인자를 만들고 (예: 변이는 원본을 바꾸므로 복사본), 시간에는 넣지 않는다
+def measure(fn, setup=None, repeat=5):
+    times = []
+    for i in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+
+    args = setup() if setup is not None else ()
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'best': min(times), 'mean': sum(times) / len(times), 'peakBytes': peak}
+
+
+# 인스턴스 하나에서 잴 항목들: 이름 -> (함수, setup, 최대 도시 수)
+def cases(tourmanager, populationSize, rng):
+    n = tourmanager.numberOfCities()
+    ga = GA(tourmanager)
+    pop = randomPopulation(tourmanager, populationSize, rng)
+    pop.evaluate()
+    parent1, parent2 = pop.getTour(0), pop.getTour(1)
+    parent1.getPositions()
+
+    def parents():
+        return (parent1, parent2)
+
+    def child():
+        return (parent1.copy(),)
+
+    # 거리 캐시가 없는 새 여행
+    def stale():
+        return (Tour(tourmanager, parent1.getOrder().copy()),)
+
+    def population():
+        fresh = Population(tourmanager, populationSize, False)
+        for i in range(populationSize):
+            fresh.saveTour(i, pop.getTour(i).copy())
+        return (fresh,)
+
+    # dfs.tour 의 진행 출력은 버린다
+    def dfsTour():
+        with contextlib.redirect_stdout(io.StringIO()):
+            dfs.tour(tourmanager.destinationCities, max(1, n // 100), tourmanager,
+                     index=GridIndex(tourmanager.getCoordinates()))
+
+    return {
+        'orderCrossover': (ga.orderCrossover, parents, None),
+        'PMXCrossover': (ga.PMXCrossover, parents, None),
+        'cycleCrossover': (ga.cycleCrossover, parents, None),
+        'EAXCrossover': (ga.EAXCrossover, parents, None),
+        'frontOrderCrossover': (ga.frontOrderCrossover, parents, QUADRATIC_LIMIT),
+        'swapMutate': (ga.swapMutate, child, None),
+        'inversionMutate': (ga.inversionMutate, child, None),
+        'neighborSwapMutate': (ga.neighborSwapMutate, child, None),
+        'neighborInsertionMutate': (ga.neighborInsertionMutate, child, None),
+        'neighborInversionMutate': (ga.neighborInversionMutate, child, None),
+        'rouletteSelection': (ga.rouletteSelection, population, None),
+        'tournamentSelection': (ga.tournamentSelection, population, None),
+        'rankingSelecton': (ga.rankingSelecton, population, None),
+        'elitSelection': (ga.elitSelection, population, None),
+        'getDistance': (lambda tour: tour.getDistance(), stale, None),
+        'randomize': (lambda: randomPopulation(tourmanager, populationSize, rng), None, None),
+        'dfs.tour': (dfsTour, None, None),
+        'hilbertOrder': (lambda: hilbertOrder(tourmanager.getCoordinates()), None, None),
+        'nearestNeighborOrder': (lambda: nearestNeighborOrder(tourmanager.getCoordinates()), None, None),
+        'greedyOrder': (lambda: greedyOrder(tourmanager.getCoordinates(), tourmanager.getNeighbors(8)), None, None),
+        'evolvePopulation': (ga.evolvePopulation, population, None),
+    }
+
+
+# 현재 커밋 (git 이 없으면 None)
+def gitCommit():
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        return output.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(sizes=SIZES, kinds=KINDS, repeat=5, populationSize=10, seed=0, only=None, log=print, dtype=np.float64):
+    results = []
+    for kind in kinds:
+        for n in sizes:
+            random.seed(seed)
+            rng = np.random.default_rng(seed)
+            tourmanager = makeTourManager(makeCities(kind, n, seed), dtype)
+            for name, (fn, setup, limit) in cases(tourmanager, populationSize, rng).items():
+                if only is not None and name not in only:
+                    continue
+                result = {'instance': kind, 'cities': n, 'benchmark': name}
+                if limit is not None and n > limit:
+                    result['skipped'] = 'more than %d cities' % limit
+                else:
+                    result.update(measure(fn, setup, repeat))
+                results.append(result)
+                if log is not None:
+                    log(formatResult(result))
+    return {
+        'commit': gitCommit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': repeat,
+        'populationSize': populationSize,
+        'seed': seed,
+        'dtype': np.dtype(dtype).name,
+        'results': results,
+    }
+
+
+def formatResult(result):
+    name = '%-10s %7d %-20s' % (result['instance'], result['cities'], result['benchmark'])
+    if 'skipped' in result:
+        return name + ' skipped (' + result['skipped'] + ')'
+    return name + ' %10.6f s  %10.1f KiB' % (result['best'], result['peakBytes'] / 1024)
+
+
+# 두 결과 파일의 같은 항목끼리 시간 비 (new / old), 1 보다 작으면 빨라진 것
+def compare(old, new):
+    before = {(r['instance'], r['cities'], r['benchmark']): r for r in old['results'] if 'best' in r}
+    rows = []
+    for result in new['results']:
+        key = (result['instance'], result['cities'], result['benchmark'])
+        if 'best' in result and key in before:
+            rows.append(key + (before[key]['best'], result['best'], result['best'] / before[key]['best']))
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='GA operator benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--kinds', nargs='+', default=KINDS, choices=KINDS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--population', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', default=None, help='benchmark names to run')
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', default=None, help='earlier result file to compare against')
+    parser.add_argument('--float32', action='store_true', help='keep the distance matrix in float32')
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.kinds, args.repeat, args.population, args.seed, args.only,
+                 dtype=np.float32 if args.float32 else np.float64)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            old = json.load(f)
+        for instance, cities, benchmark, before, after, ratio in compare(old, report):
+            print('%-10s %7d %-20s %10.6f -> %10.6f  x%.2f' % (instance, cities, benchmark, before, after, ratio))
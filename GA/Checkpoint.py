@@ -0,0 +1,84 @@
+# 진화 상태 저장 / 이어서 실행
+# 인구의 도시 index 배열, 캐시된 거리, random / np.random 상태, 세대 번호를 np.savez 파일 하나에 저장
+# 임시 파일에 쓴 뒤 이름을 바꾸므로 저장 도중 죽어도 이전 checkpoint 는 남는다
+# 같은 checkpoint 에서 이어서 실행하면 끊지 않고 돌린 것과 결과가 비트 단위로 같다
+# 군집마다 인구가 따로 있으면 (ga2) 블록 여러 개를 이어 붙이고 모양(shape)을 같이 저장
+
+import os
+import random
+import numpy as np
+from City import Tour
+from City import Population
+
+
+# random, np.random 상태를 배열로
+def randomState():
+    version, internal, gauss = random.getstate()
+    name, keys, pos, hasGauss, cachedGaussian = np.random.get_state(legacy=True)
+    return {
+        'pythonVersion': np.array(version),
+        'pythonState': np.array(internal, dtype=np.uint64),
+        'pythonGauss': np.array(np.nan if gauss is None else gauss),
+        'numpyKeys': keys,
+        'numpyState': np.array([pos, hasGauss], dtype=np.int64),
+        'numpyGaussian': np.array(cachedGaussian),
+    }
+
+
+def setRandomState(data):
+    gauss = float(data['pythonGauss'])
+    random.setstate((int(data['pythonVersion']), tuple(int(x) for x in data['pythonState']),
+                     None if np.isnan(gauss) else gauss))
+    pos, hasGauss = data['numpyState'].tolist()
+    np.random.set_state(('MT19937', data['numpyKeys'], pos, hasGauss, float(data['numpyGaussian'])))
+
+
+# orders: 블록마다 (인구 수 x 도시 수) 배열, lengths: 블록마다 캐시된 거리 (0 은 아직 계산 안 함)
+def saveCheckpoint(path, orders, lengths, generation):
+    shapes = np.array([block.shape for block in orders], dtype=np.int64).reshape(-1, 2)
+    data = randomState()
+    data['orders'] = np.concatenate([np.asarray(block, dtype=np.int32).ravel() for block in orders])
+    data['lengths'] = np.concatenate([np.asarray(block, dtype=np.float64) for block in lengths])
+    data['shapes'] = shapes
+    data['generation'] = np.array(generation, dtype=np.int64)
+
+    temporary = path + '.tmp.npz'
+    np.savez(temporary, **data)
+    os.replace(temporary, path)
+
+
+# (orders 블록 리스트, lengths 블록 리스트, 세대 번호), restoreRandom 이면 난수 상태도 되돌린다
+def loadCheckpoint(path, restoreRandom=True):
+    with np.load(path) as data:
+        if restoreRandom:
+            setRandomState(data)
+        orders = []
+        lengths = []
+        offset = 0
+        count = 0
+        for rows, columns in data['shapes'].tolist():
+            orders.append(data['orders'][offset:offset + rows * columns].reshape(rows, columns))
+            lengths.append(data['lengths'][count:count + rows])
+            offset += rows * columns
+            count += rows
+        return orders, lengths, int(data['generation'])
+
+
+# City.Population 저장 / 복원
+def savePopulation(path, pop, generation):
+    orders = pop.getOrderMatrix()
+    lengths = np.array([tour.distance for tour in pop.tours], dtype=np.float64)
+    saveCheckpoint(path, [orders], [lengths], generation)
+
+
+# (Population, 다음에 실행할 세대 번호)
+def loadPopulation(path, tourmanager, restoreRandom=True):
+    orders, lengths, generation = loadCheckpoint(path, restoreRandom)
+    if orders[0].shape[1] != tourmanager.numberOfCities():
+        raise ValueError('checkpoint has %d cities, tourmanager has %d'
+                         % (orders[0].shape[1], tourmanager.numberOfCities()))
+    pop = Population(tourmanager, len(orders[0]), False)
+    for i in range(len(orders[0])):
+        pop.saveTour(i, Tour(tourmanager, orders[0][i]))
+        pop.getTour(i).distance = float(lengths[0][i])
+    return pop, generation
@@ -1,8 +1,12 @@
 import math
 import random
 import csv
-import matplotlib.pyplot as plt
 import numpy as np
+from Neighbor import nearestNeighbors
+
+# 거리 행렬에 쓸 최대 메모리 (byte), 넘으면 좌표로 바로 계산
+# float64 는 약 8000 도시, float32 는 약 11500 도시까지
+MATRIX_BYTES = 512 * 2 ** 20
 
 # TSP 도시 생성 클래스
 class City:
@@ -21,11 +25,9 @@ class City:
     def getIndex(self):
         return self.index
 
-    # 도시 사이 거리 계산
+    # 도시 사이 거리 계산 (여러 번 쓸 때는 TourManager.getDistance 사용)
     def getDistance(self, post_city):
-        distance = np.linalg.norm(
-            np.array([float(self.x), float(self.y)]) - np.array([float(post_city.x), float(post_city.y)]))
-        return distance
+        return math.hypot(float(self.x) - float(post_city.x), float(self.y) - float(post_city.y))
 
     # 도시 x, y좌표 리턴
     def __repr__(self):
@@ -33,14 +35,20 @@ class City:
 
 
 # 여행 매니저
+# 도시의 index 는 destinationCities 에서의 위치와 같아야 한다 (거리 행렬 index)
 class TourManager:
-    # 도착 도시 리스트
-    def __init__(self):
+    # 도착 도시 리스트, dtype=np.float32 이면 거리 행렬 메모리가 절반
+    def __init__(self, dtype=np.float64):
         self.destinationCities = []
+        self.dtype = dtype
+        self.coordinates = None
+        self.distanceMatrix = None
+        self.neighbors = {}
 
     # 도착할 도시(클래스) 추가
     def addCity(self, city):
         self.destinationCities.append(city)
+        self.resetDistance()
 
     # 도착한 도시 중에 가져오기
     def getCity(self, index):
@@ -52,35 +60,164 @@ class TourManager:
 
     def setCity(self, cities):
         self.destinationCities = cities
+        self.resetDistance()
+
+    # 도시가 바뀌면 좌표, 거리 캐시 초기화
+    def resetDistance(self):
+        self.coordinates = None
+        self.distanceMatrix = None
+        self.neighbors = {}
+
+    # 도시 좌표 배열 (n x 2)
+    def getCoordinates(self):
+        if self.coordinates is None:
+            xy = [[float(city.x), float(city.y)] for city in self.destinationCities]
+            self.coordinates = np.array(xy, dtype=np.float64).reshape(-1, 2)
+        return self.coordinates
+
+    # 도시마다 가까운 k 개 도시 index (n x k), k 별로 한 번만 계산
+    def getNeighbors(self, k=8):
+        if k not in self.neighbors:
+            self.neighbors[k] = nearestNeighbors(self.getCoordinates(), k)
+        return self.neighbors[k]
+
+    # dtype 크기로 계산한 거리 행렬이 MATRIX_BYTES 안에 들어가면 행렬 사용
+    def useMatrix(self):
+        n = self.numberOfCities()
+        return n * n * np.dtype(self.dtype).itemsize <= MATRIX_BYTES
+
+    # 모든 도시 쌍 거리를 한 번에 계산 (임시 메모리를 줄이려고 block 행씩 계산)
+    def buildDistanceMatrix(self, block=1024):
+        xy = self.getCoordinates()
+        n = len(xy)
+        matrix = np.empty((n, n), dtype=self.dtype)
+        for start in range(0, n, block):
+            end = min(start + block, n)
+            matrix[start:end] = np.hypot(xy[start:end, 0, None] - xy[:, 0], xy[start:end, 1, None] - xy[:, 1])
+        self.distanceMatrix = matrix
+        return matrix
+
+    def getDistanceMatrix(self):
+        if self.distanceMatrix is None:
+            self.buildDistanceMatrix()
+        return self.distanceMatrix
+
+    # 두 도시(index) 사이 거리
+    def getDistance(self, fromIndex, toIndex):
+        if self.useMatrix():
+            return float(self.getDistanceMatrix()[fromIndex, toIndex])
+        xy = self.getCoordinates()
+        return math.hypot(xy[fromIndex, 0] - xy[toIndex, 0], xy[fromIndex, 1] - xy[toIndex, 1])
+
+    # 도시 index 순서의 여행 길이 (마지막 도시 -> 처음 도시 포함)
+    def tourLength(self, order):
+        order = np.asarray(order, dtype=np.intp)
+        nextOrder = np.roll(order, -1)
+        if self.useMatrix():
+            return float(self.getDistanceMatrix()[order, nextOrder].sum(dtype=np.float64))
+        xy = self.getCoordinates()
+        diff = xy[order] - xy[nextOrder]
+        return float(np.hypot(diff[:, 0], diff[:, 1]).sum())
+
+    # (여행 수 x 도시 수) index 배열의 모든 여행 길이를 한 번에 계산
+    # 한 번에 계산하는 양이 많으므로 거리 행렬이 아직 없으면 만들지 않고 좌표로 계산
+    def tourLengths(self, orders):
+        if self.useMatrix() and self.distanceMatrix is not None:
+            return orderLengths(self.distanceMatrix, orders, matrix=True)
+        return orderLengths(self.getCoordinates(), orders)
+
+
+# (여행 수 x 도시 수) index 배열의 모든 닫힌 여행 길이, table 은 좌표 (n x 2) 또는 거리 행렬 (matrix)
+# 중간 배열이 커지지 않게 block 개 원소 정도씩 여행 몇 개를 묶어서 계산, 좌표는 x, y 를 따로 모은다
+def orderLengths(table, orders, matrix=False, block=1 << 22):
+    orders = np.asarray(orders)
+    rows = max(1, block // max(orders.shape[1], 1))
+    lengths = np.empty(len(orders), dtype=np.float64)
+    if not matrix:
+        x = np.ascontiguousarray(table[:, 0])
+        y = np.ascontiguousarray(table[:, 1])
+    for start in range(0, len(orders), rows):
+        part = orders[start:start + rows]
+        nextPart = np.roll(part, -1, axis=1)
+        if matrix:
+            lengths[start:start + rows] = table[part, nextPart].sum(axis=1, dtype=np.float64)
+        else:
+            px = x[part]
+            py = y[part]
+            dx = px - x[nextPart]
+            dy = py - y[nextPart]
+            lengths[start:start + rows] = np.hypot(dx, dy).sum(axis=1)
+    return lengths
+
+
+# City 리스트(None 은 빈 자리) 또는 도시 index 배열을 int32 index 배열로 변환
+def toOrder(tour):
+    if isinstance(tour, np.ndarray):
+        return tour.astype(np.int32)
+    order = []
+    for city in tour:
+        if city is None:
+            order.append(-1)
+        elif isinstance(city, (int, np.integer)):
+            order.append(city)
+        else:
+            order.append(city.index)
+    return np.array(order, dtype=np.int32)
+
+
+# 도시 0 을 맨 앞에 고정하고 나머지 도시를 행마다 섞은 (number x n) int32 배열
+# rng 가 없으면 np.random 전역 상태로 Generator 를 만들어서 np.random.seed 로 재현된다
+def randomOrders(number, n, rng=None):
+    if rng is None:
+        rng = np.random.default_rng(np.random.randint(0, 2 ** 31 - 1))
+    orders = np.zeros((number, n), dtype=np.int32)
+    if n > 1:
+        rest = np.broadcast_to(np.arange(1, n, dtype=np.int32), (number, n - 1))
+        orders[:, 1:] = rng.permuted(rest, axis=1)
+    return orders
+
+
+# 여행 길이 계산 횟수 (Metrics 가 세대마다 차이를 기록)
+# evaluations: 길이 전체 계산, deltas: 바뀐 간선만 다시 계산
+class EvaluationCounter:
+    evaluations = 0
+    deltas = 0
+
+    @classmethod
+    def snapshot(cls):
+        return cls.evaluations, cls.deltas
 
 
 # 여행 클래스(적합도 계산)
+# order: 방문 순서대로의 도시 index 배열 (빈 자리는 -1)
+# position: 도시 index -> order 에서의 위치 (없으면 -1), 필요할 때 만든다
 class Tour:
     def __init__(self, tourmanager, tour=None):
         self.tourmanager = tourmanager
-        self.tour = []
         self.fitness = 0.0
         self.distance = 0
+        self.position = None
         #self.cities_order = []
         #self.total_length = 0
 
         if tour is not None:
-            self.tour = tour
+            self.order = toOrder(tour)
         else:
-            for i in range(0, self.tourmanager.numberOfCities()):
-                self.tour.append(None)
+            self.order = np.full(self.tourmanager.numberOfCities(), -1, dtype=np.int32)
 
     # 여행 수 리턴
     def __len__(self):
-        return len(self.tour)
+        return len(self.order)
 
-    # 특정 여행 리턴
+    # 특정 여행 리턴 (slice 는 City 리스트)
     def __getitem__(self, index):
-        return self.tour[index]
+        if isinstance(index, slice):
+            return [self.getCity(i) for i in range(*index.indices(self.tourSize()))]
+        return self.getCity(index)
 
     # 특정 여행 설정
     def __setitem__(self, key, value):
-        self.tour[key] = value
+        self.setCity(key, value)
 
     # 결과 리턴
     def __repr__(self):
@@ -90,42 +227,167 @@ class Tour:
         geneString += 'End'
         return geneString
 
+    # 예전 코드를 위한 City 리스트
+    @property
+    def tour(self):
+        return self[:]
+
     def generate(self):
-        for cityIndex in range(0, self.tourmanager.numberOfCities()):
-            self.setCity(cityIndex, self.tourmanager.getCity(cityIndex))
+        self.setOrder(np.arange(self.tourmanager.numberOfCities(), dtype=np.int32))
 
-    # 이동할 도시 추가
+    # 이동할 도시 추가 (시작 도시 0 이 맨 앞)
     def generateIndividual(self):
-        for cityIndex in range(0, self.tourmanager.numberOfCities()):
-            self.setCity(cityIndex, self.tourmanager.getCity(cityIndex))
-        #random.shuffle(self.tour)
-        for cityIndex in range(0, self.tourmanager.numberOfCities()):
-            if self.getCity(cityIndex) == self.tourmanager.getCity(0):
-                self.tour[0], self.tour[cityIndex] = self.tour[cityIndex], self.tour[0]
+        self.setOrder(np.arange(self.tourmanager.numberOfCities(), dtype=np.int32))
 
     def getCity(self, tourPosition):
-        return self.tour[tourPosition]
+        cityIndex = self.order[tourPosition]
+        if cityIndex < 0:
+            return None
+        return self.tourmanager.getCity(cityIndex)
 
     def getIndex(self, city):
-        return self.tour.index(city)
+        if city is None:
+            empty = np.flatnonzero(self.order < 0)
+            if len(empty) == 0:
+                raise ValueError('tour is full')
+            return int(empty[0])
+        tourPosition = self.getPositions()[city.index]
+        if tourPosition < 0:
+            raise ValueError('city is not in tour')
+        return int(tourPosition)
 
     def getCount(self):
-        count = 0
-        for i in range(0, self.tourSize()):
-            if self.getCity(i) == None:
-                count += 1
-        return count
+        return int(np.count_nonzero(self.order < 0))
+
+    # 도시 index 배열
+    def getOrder(self):
+        return self.order
+
+    # 도시 index -> 여행 위치 배열
+    def getPositions(self):
+        if self.position is None:
+            self.position = np.full(self.tourmanager.numberOfCities(), -1, dtype=np.int32)
+            filled = np.flatnonzero(self.order >= 0)
+            self.position[self.order[filled]] = filled
+        return self.position
+
+    # 도시 index 배열을 통째로 설정 (distance 를 알면 같이 넘긴다)
+    def setOrder(self, order, distance=0):
+        self.order = toOrder(order)
+        self.position = None
+        self.distance = distance
+        self.fitness = 0.0
+
+    def copy(self):
+        newTour = Tour(self.tourmanager, self.order)
+        newTour.distance = self.distance
+        newTour.fitness = self.fitness
+        return newTour
 
     # TSP에서 이용할 도시 리스트 추가
     def setCity(self, tourPosition, city):
-        self.tour[tourPosition] = city
+        if tourPosition < 0:
+            tourPosition += self.tourSize()
+        if self.position is not None:
+            oldIndex = self.order[tourPosition]
+            if oldIndex >= 0 and self.position[oldIndex] == tourPosition:
+                self.position[oldIndex] = -1
+            if city is not None:
+                self.position[city.index] = tourPosition
+        self.order[tourPosition] = -1 if city is None else city.index
         self.fitness = 0.0
         self.distance = 0
 
+    # 간선 k 는 order[k] -> order[k+1] (마지막은 처음 도시로)
+    def edgeLength(self, edges):
+        size = self.tourSize()
+        length = 0.0
+        for k in edges:
+            length += self.tourmanager.getDistance(self.order[k], self.order[(k + 1) % size])
+        return length
+
+    # swapCities / reverseSegment / moveCity 의 간선 갱신은 거리가 이미 있는 여행에만 쓰인다
+    # (2-opt, Or-opt, EAX 자식처럼 길이를 들고 있는 여행). 순서 / PMX / 사이클 교차 자식은 거리가 0 이라
+    # 변이는 순서만 바꾸고, 길이는 다음 세대 Population.evaluate 에서 한 번에 계산된다
+
+    # 두 위치의 도시 바꾸기, 거리가 계산돼 있으면 바뀐 간선(최대 4개)만으로 갱신
+    def swapCities(self, tourPos1, tourPos2):
+        size = self.tourSize()
+        tourPos1 %= size
+        tourPos2 %= size
+        if tourPos1 == tourPos2:
+            return
+        edges = {(tourPos1 - 1) % size, tourPos1, (tourPos2 - 1) % size, tourPos2}
+        delta = -self.edgeLength(edges) if self.distance != 0 else 0.0
+
+        city1 = self.order[tourPos1]
+        city2 = self.order[tourPos2]
+        self.order[tourPos1] = city2
+        self.order[tourPos2] = city1
+        if self.position is not None:
+            self.position[city2] = tourPos1
+            self.position[city1] = tourPos2
+        self.updateDistance(delta, edges)
+
+    # start ~ end 구간 뒤집기, 거리가 계산돼 있으면 양 끝 간선 2개만으로 갱신
+    def reverseSegment(self, start, end):
+        size = self.tourSize()
+        if start >= end:
+            return
+        edges = {(start - 1) % size, end % size}
+        delta = -self.edgeLength(edges) if self.distance != 0 else 0.0
+
+        self.order[start:end+1] = self.order[start:end+1][::-1].copy()
+        if self.position is not None:
+            self.position[self.order[start:end+1]] = np.arange(start, end+1, dtype=np.int32)
+        self.updateDistance(delta, edges)
+
+    # tourPos1 의 도시를 빼서 tourPos2 자리에 끼워 넣기 (사이 도시들은 한 칸씩 민다)
+    # 거리가 계산돼 있으면 빠지는 간선 3개, 생기는 간선 3개로 갱신
+    def moveCity(self, tourPos1, tourPos2):
+        size = self.tourSize()
+        tourPos1 %= size
+        tourPos2 %= size
+        if tourPos1 == tourPos2:
+            return
+        order = self.order
+        city = order[tourPos1]
+        # 마지막 도시를 맨 앞으로 (또는 반대로) 옮기는 것은 닫힌 여행의 회전이라 길이가 같다
+        rotation = (tourPos1 == size - 1 and tourPos2 == 0) or (tourPos1 == 0 and tourPos2 == size - 1)
+        if self.distance != 0 and not rotation:
+            before = order[tourPos1 - 1]
+            after = order[(tourPos1 + 1) % size]
+            # 도시를 뺀 뒤 끼워 넣을 자리 양 옆 도시
+            if tourPos1 < tourPos2:
+                left, right = order[tourPos2], order[(tourPos2 + 1) % size]
+            else:
+                left, right = order[tourPos2 - 1], order[tourPos2]
+            distance = self.tourmanager.getDistance
+            self.distance += (distance(before, after) + distance(left, city) + distance(city, right)
+                              - distance(before, city) - distance(city, after) - distance(left, right))
+            EvaluationCounter.deltas += 1
+        self.fitness = 0.0
+
+        if tourPos1 < tourPos2:
+            order[tourPos1:tourPos2] = order[tourPos1+1:tourPos2+1]
+            start, end = tourPos1, tourPos2
+        else:
+            order[tourPos2+1:tourPos1+1] = order[tourPos2:tourPos1]
+            start, end = tourPos2, tourPos1
+        order[tourPos2] = city
+        if self.position is not None:
+            self.position[order[start:end+1]] = np.arange(start, end+1, dtype=np.int32)
+
+    def updateDistance(self, delta, edges):
+        if self.distance != 0:
+            self.distance += delta + self.edgeLength(edges)
+            EvaluationCounter.deltas += 1
+        self.fitness = 0.0
+
     def setCityList(self, start, end, cluster_tour):
         for i in range(0, (end-start+1)):
             print(cluster_tour.getCity(i))
-            self.tour[start+i] = cluster_tour.getCity(i)
+            self.setCity(start+i, cluster_tour.getCity(i))
 
     # fitness(적합도) 계산 후 리턴
     def getFitness(self):
@@ -133,36 +395,37 @@ class Tour:
             self.fitness = 1 / float(self.getDistance())
         return self.fitness
 
-    # 거리 계산
+    # 거리 계산 (TourManager 거리 행렬에서 도시 index 로 조회)
     def getDistance(self):
         if self.distance == 0:
-            tourDistance = 0
-            for cityIndex in range(0, self.tourSize()):
-                fromCity = self.getCity(cityIndex)
-                destinationCity = None
-                if cityIndex + 1 < self.tourSize():
-                    destinationCity = self.getCity(cityIndex + 1)
-                else:
-                    destinationCity = self.getCity(0)
-                tourDistance += fromCity.getDistance(destinationCity)
-            self.distance = tourDistance
+            self.distance = self.tourmanager.tourLength(self.order)
+            EvaluationCounter.evaluations += 1
         return self.distance
 
     # 여행 크기
     def tourSize(self):
-        return len(self.tour)
+        return len(self.order)
 
     # 특정 도시가 여행에 포함되어있는지 확인
     def containsCity(self, city):
-        return city in self.tour
+        if city is None:
+            return self.getCount() > 0
+        return self.getPositions()[city.index] >= 0
 
 
 # 인구 클래스
 class Population:
     def __init__(self, tourmanager, populationSize, initialise):
+        self.tourmanager = tourmanager
         self.tours = []
         self.elit = []
         self.isElit = 0
+        # 마지막 evaluate 결과 (길이, 적합도 높은 순 index, 가장 좋은 index)
+        self.lengths = None
+        self.ranks = None
+        self.fittestIndex = 0
+        # 세대 동안 쓰는 룰렛 휠 (여행이 바뀌면 초기화)
+        self.wheel = None
         for i in range(0, populationSize):
             self.tours.append(None)
 
@@ -174,14 +437,40 @@ class Population:
 
     # 여행을 리스트에 추가
     def __setitem__(self, key, value):
-        self.tours[key] = value
+        self.saveTour(key, value)
 
     def __getitem__(self, index):
         return self.tours[index]
 
-    # 여행을 리스트에 추가
+    # 모든 자리를 도시 0 으로 시작하는 랜덤 여행으로 채우고 길이도 한 번에 계산
+    def randomize(self, rng=None):
+        return self.setOrders(randomOrders(self.populationSize(), self.tourmanager.numberOfCities(), rng))
+
+    # 시작 여행을 방법별 개수로 섞어서 채우기 (Seeding.METHODS), 예: {'greedy': 1, 'nearest': 4, 'hilbert': 5}
+    # 남는 자리는 랜덤 여행
+    def seed(self, mix, rng=None):
+        from Seeding import seedOrders
+        orders = seedOrders(self.tourmanager.getCoordinates(), mix, self.populationSize(), rng,
+                            self.tourmanager.getNeighbors(8) if mix.get('greedy', 0) > 0 else None)
+        return self.setOrders(orders)
+
+    # (인구 수 x 도시 수) 순서 배열로 모든 자리를 채우고 길이도 한 번에 계산
+    def setOrders(self, orders):
+        lengths = self.tourmanager.tourLengths(orders)
+        for i in range(self.populationSize()):
+            tour = Tour(self.tourmanager, orders[i])
+            tour.distance = float(lengths[i])
+            self.saveTour(i, tour)
+        EvaluationCounter.evaluations += len(orders)
+        return self
+
+    # 여행을 리스트에 추가, 세대 동안 캐시한 길이 / 순위 / 룰렛 휠은 버린다
+    # (넣은 뒤 여행을 제자리에서 바꾸면 다시 saveTour 해야 순위에 반영된다)
     def saveTour(self, index, tour):
         self.tours[index] = tour
+        self.lengths = None
+        self.ranks = None
+        self.wheel = None
 
     def getTour(self, index):
         return self.tours[index]
@@ -190,20 +479,53 @@ class Population:
         self.elit = self.getFittest()
         self.isElit = 1
 
+    # 모든 여행의 도시 index 를 (인구 수 x 도시 수) 배열로
+    def getOrderMatrix(self):
+        return np.stack([tour.getOrder() for tour in self.tours])
+
+    # 거리가 없는 여행들을 한 배열로 모아 한 번에 길이 계산 후 순위 갱신
+    # 결과는 saveTour 전까지 캐시되므로 선택 중에 여러 번 불러도 다시 훑지 않는다
+    def evaluate(self):
+        if self.lengths is not None:
+            return self.lengths
+        stale = [i for i in range(self.populationSize()) if self.tours[i].distance == 0]
+        if len(stale) > 0:
+            sizes = set(self.tours[i].tourSize() for i in stale)
+            if len(sizes) == 1:
+                block = np.stack([self.tours[i].getOrder() for i in stale])
+                lengths = self.tourmanager.tourLengths(block)
+                for i, length in zip(stale, lengths):
+                    self.tours[i].distance = float(length)
+                EvaluationCounter.evaluations += len(stale)
+            else:
+                for i in stale:
+                    self.tours[i].getDistance()
+        self.lengths = np.array([tour.distance for tour in self.tours], dtype=np.float64)
+        self.ranks = np.argsort(self.lengths, kind='stable')
+        # 같은 적합도면 뒤쪽 여행 (예전 getFittest 와 같음)
+        self.fittestIndex = len(self.lengths) - 1 - int(np.argmin(self.lengths[::-1]))
+        return self.lengths
+
     # 가장 적합도가 높은 투어 가져오기
     def getFittest(self):
-        fittest = self.tours[0]
-        for i in range(0, self.populationSize()):
-            if fittest.getFitness() <= self.getTour(i).getFitness():
-                fittest = self.getTour(i)
-        return fittest
+        self.evaluate()
+        return self.tours[self.fittestIndex]
+
+    def getFittestIndex(self):
+        self.evaluate()
+        return self.fittestIndex
+
+    # 적합도 높은 순서의 여행 index 배열
+    def getRanks(self):
+        self.evaluate()
+        return self.ranks
 
     # 여행들 리스트 크기
     def populationSize(self):
         return len(self.tours)
 
+    def getFitnessArray(self):
+        return 1.0 / self.evaluate()
+
     def getFitnessList(self):
-        fitness_list = []
-        for i in range(0, self.populationSize()):
-            fitness_list.append(self.getTour(i).getFitness())
-        return fitness_list
\ No newline at end of file
+        return self.getFitnessArray().tolist()
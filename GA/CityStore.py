@@ -0,0 +1,126 @@
+# 도시 좌표 읽기
+# CSV(한 줄에 x,y) 또는 TSPLIB(.tsp 의 NODE_COORD_SECTION) 를 한 번만 파싱하고
+# 파일 내용 hash 를 이름에 넣은 .npy 캐시를 옆에 저장해서 다음 실행부터는 memory-map 으로 연다
+# 같은 프로세스에서는 모든 모듈이 같은 좌표 배열을 같이 쓴다
+
+import os
+import re
+import glob
+import tempfile
+import hashlib
+import numpy as np
+from City import City
+from City import TourManager
+
+# 프로세스 안에서 읽은 좌표 (경로, 크기, 수정 시각) -> 배열
+loaded = {}
+
+
+# 파일 내용 hash (캐시 이름에 사용)
+def fileHash(path, chunk=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(chunk)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cachePath(path, digest):
+    return '%s.%s.npy' % (path, digest)
+
+
+def parseCSV(path):
+    return np.loadtxt(path, delimiter=',', dtype=np.float64, ndmin=2)[:, :2]
+
+
+# TSPLIB: NODE_COORD_SECTION 아래 "번호 x y" 줄을 EOF 까지 읽는다
+def parseTSPLIB(path):
+    coordinates = []
+    with open(path, 'r') as f:
+        section = False
+        for line in f:
+            line = line.strip()
+            if not section:
+                section = line.startswith('NODE_COORD_SECTION')
+                continue
+            if line == '' or line == 'EOF':
+                break
+            fields = line.split()
+            coordinates.append([float(fields[1]), float(fields[2])])
+    return np.array(coordinates, dtype=np.float64).reshape(-1, 2)
+
+
+def parseCoordinates(path):
+    if path.lower().endswith('.tsp'):
+        return parseTSPLIB(path)
+    return parseCSV(path)
+
+
+# 프로세스마다 따로 만든 임시 파일에 쓰고 이름을 바꿔서, 여러 프로세스가 같은 파일을 처음 읽어도 겹치지 않는다
+# 내용이 바뀐 예전 캐시 (hash 가 다른 path.<hash>.npy) 만 지우고 임시 파일과 지금 캐시는 남긴다
+def writeCache(path, target, coordinates):
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=folder, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, coordinates)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, target)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    pattern = re.compile(re.escape(os.path.basename(path)) + r'\.[0-9a-f]{32}\.npy$')
+    for old in glob.glob(glob.escape(path) + '.*.npy'):
+        if pattern.match(os.path.basename(old)) and os.path.abspath(old) != os.path.abspath(target):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+# 도시 좌표 (n x 2) 배열, n 을 주면 앞에서 n 개만
+# cache 면 .npy 캐시를 쓰고 (쓸 수 없는 폴더면 파싱만), 읽기 전용 memory-map 을 리턴한다
+def loadCoordinates(path, n=None, cache=True):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, cache)
+    if key not in loaded:
+        coordinates = None
+        if cache:
+            target = cachePath(path, fileHash(path))
+            try:
+                coordinates = np.load(target, mmap_mode='r')
+            except (OSError, ValueError, EOFError):
+                coordinates = None
+            if coordinates is None:
+                coordinates = parseCoordinates(path)
+                try:
+                    writeCache(path, target, coordinates)
+                    coordinates = np.load(target, mmap_mode='r')
+                except (OSError, ValueError, EOFError):
+                    # 쓸 수 없는 폴더이거나 다른 프로세스와 겹치면 파싱한 배열을 그대로 쓴다
+                    pass
+        else:
+            coordinates = parseCoordinates(path)
+        loaded[key] = coordinates
+    coordinates = loaded[key]
+    if n is not None:
+        coordinates = coordinates[:n]
+    return coordinates
+
+
+# 좌표 파일로 City 리스트 만들기 (index 는 0 부터)
+def loadCities(path, n=None):
+    coordinates = loadCoordinates(path, n)
+    return [City(x, y, i) for i, (x, y) in enumerate(coordinates.tolist())]
+
+
+# 좌표 파일로 TourManager 만들기, 좌표 배열은 다시 만들지 않고 같이 쓴다
+def loadTourManager(path, n=None, dtype=np.float64):
+    tourmanager = TourManager(dtype)
+    tourmanager.setCity(loadCities(path, n))
+    tourmanager.coordinates = loadCoordinates(path, n)
+    return tourmanager
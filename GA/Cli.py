@@ -0,0 +1,85 @@
+# 명령행 옵션
+# 실행 파일들이 같은 옵션 이름을 쓰고, --config 로 JSON 설정 파일을 읽는다 (명령행에 준 값이 우선)
+# JSON 키는 옵션 이름에서 앞의 -- 를 빼고 - 를 _ 로 바꾼 것 (예: "n_generations": 100)
+# 인구 수, 군집 수처럼 예전에 input() 으로 묻던 값은 옵션도 설정도 없을 때만 묻는다
+
+import os
+import json
+import random
+import argparse
+import numpy as np
+
+
+# 도시 파일, 도시 수, seed, 결과 파일, 그림 파일 옵션
+# single 이 False 면 (여러 번 실행하는 Sweep) 실행 한 번에만 쓰는 --seed, --plot 은 뺀다
+def baseParser(description, output, plot=None, cities='../TSP.csv', single=True):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--config', default=None, help='JSON file with option values')
+    parser.add_argument('--cities', default=cities, help='CSV or TSPLIB city file')
+    parser.add_argument('--n-cities', dest='n_cities', type=int, default=None, help='use only the first N cities')
+    if single:
+        parser.add_argument('--seed', type=int, default=None, help='seed for random and np.random')
+    parser.add_argument('--output', default=output, help='CSV file for the solution order')
+    if single:
+        parser.add_argument('--plot', default=plot, help='PNG file written in headless mode')
+    parser.add_argument('--float32', action='store_true', help='keep the distance matrix in float32 (half the memory)')
+    return parser
+
+
+# baseParser 에 유전 알고리즘 옵션 추가, ga 는 선택지 표를 가진 GA 클래스
+def gaParser(description, output, ga, plot=None, cities='../TSP.csv', crossover='order'):
+    parser = baseParser(description, output, plot, cities)
+    parser.add_argument('--population', type=int, default=None, help='population size')
+    parser.add_argument('--generations', dest='n_generations', type=int, default=50)
+    parser.add_argument('--mutation-rate', dest='mutation_rate', type=float, default=0.1)
+    parser.add_argument('--selection', default='roulette', choices=sorted(ga.SELECTIONS))
+    parser.add_argument('--crossover', default=crossover, choices=sorted(ga.CROSSOVERS))
+    parser.add_argument('--mutation', default='swap', choices=sorted(ga.MUTATIONS))
+    parser.add_argument('--local-search', dest='local_search', default=None, choices=['elite', 'child'])
+    parser.add_argument('--checkpoint', default=os.environ.get('TSP_CHECKPOINT'),
+                        help='checkpoint file, resumed from if it exists')
+    parser.add_argument('--checkpoint-interval', dest='checkpoint_interval', type=int, default=10)
+    parser.add_argument('--metrics', default=os.environ.get('TSP_METRICS'), help='JSONL file for per-generation metrics')
+    return parser
+
+
+# --config 파일 값을 기본값으로 넣고 다시 읽는다
+def parseArgs(parser, argv=None):
+    args = parser.parse_args(argv)
+    if args.config is not None:
+        with open(args.config) as f:
+            config = json.load(f)
+        known = set(vars(args))
+        unknown = sorted(key for key in config if key not in known)
+        if unknown:
+            parser.error('unknown config keys: ' + ', '.join(unknown))
+        # set_defaults 는 choices 를 확인하지 않으므로 여기서 확인 (nargs 옵션은 리스트 값마다)
+        for action in parser._actions:
+            if action.dest not in config or action.choices is None:
+                continue
+            values = config[action.dest]
+            for value in values if isinstance(values, list) else [values]:
+                if value not in action.choices:
+                    parser.error('config %s: invalid choice %r (choose from %s)'
+                                 % (action.dest, value, ', '.join(map(str, action.choices))))
+        parser.set_defaults(**config)
+        args = parser.parse_args(argv)
+    return args
+
+
+# --float32 옵션에 맞는 거리 행렬 dtype
+def matrixDtype(args):
+    return np.float32 if args.float32 else np.float64
+
+
+def seedAll(seed):
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+
+# 값이 없으면 예전처럼 input() 으로 묻는다
+def askInt(value, prompt):
+    if value is not None:
+        return value
+    return int(input(prompt))
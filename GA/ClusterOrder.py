@@ -0,0 +1,109 @@
+import numpy as np
+
+# 이 수 이하의 군집은 Held-Karp 로 정확하게, 넘으면 최근접 이웃 + 2-opt
+EXACT_LIMIT = 15
+
+# 이 값보다 작은 개선은 무시
+EPSILON = 1e-9
+
+
+# 군집 순서 정하기
+# 군집 i 를 정방향(start -> end)으로 지나면 노드 2i, 역방향(end -> start)이면 노드 2i+1
+# cost[u][v] = 노드 u 의 나가는 도시 -> 노드 v 의 들어오는 도시 거리, 처음에 한 번만 계산한다
+# 군집 0 은 항상 맨 앞 정방향 (여행 시작 도시가 군집 0 의 시작 도시)
+class ClusterOrder:
+    def __init__(self, starts, ends):
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        self.m = len(starts)
+        entries = np.empty((2 * self.m, 2))
+        exits = np.empty((2 * self.m, 2))
+        entries[0::2], exits[0::2] = starts, ends
+        entries[1::2], exits[1::2] = ends, starts
+        diff = exits[:, None, :] - entries[None, :, :]
+        self.cost = np.hypot(diff[..., 0], diff[..., 1])
+
+    # [(군집 index, 역방향 여부), ...] 와 군집 사이 연결 길이 합(마지막 -> 군집 0 포함) 리턴
+    def solve(self):
+        if self.m <= EXACT_LIMIT:
+            nodes = self.heldKarp()
+        else:
+            nodes = self.twoOpt(self.nearestNeighbor())
+        return [(node // 2, node % 2 == 1) for node in nodes], self.cycleCost(nodes)
+
+    def cycleCost(self, nodes):
+        nodes = np.asarray(nodes)
+        return float(self.cost[nodes, np.roll(nodes, -1)].sum())
+
+    # 비트마스크 DP, 같은 개수의 군집을 지난 상태들을 한 번에 넓힌다
+    def heldKarp(self):
+        k = self.m - 1
+        if k == 0:
+            return [0]
+        nodes = np.arange(2, 2 * self.m)
+        T = len(nodes)
+        cost = self.cost[np.ix_(nodes, nodes)]
+        bit = 1 << (nodes // 2 - 1)
+        full = (1 << k) - 1
+
+        dp = np.full((full + 1, T), np.inf)
+        dp[bit, np.arange(T)] = self.cost[0, nodes]
+        popcount = np.zeros(full + 1, dtype=np.int64)
+        for b in range(k):
+            popcount += (np.arange(full + 1) >> b) & 1
+
+        targets = np.arange(T)
+        for size in range(1, k):
+            masks = np.flatnonzero(popcount == size)
+            best = (dp[masks][:, :, None] + cost[None, :, :]).min(axis=1)
+            valid = (masks[:, None] & bit[None, :]) == 0
+            newMasks = (masks[:, None] | bit[None, :])[valid]
+            newTargets = np.broadcast_to(targets, valid.shape)[valid]
+            np.minimum.at(dp, (newMasks, newTargets), best[valid])
+
+        # 마지막 노드부터 거꾸로 따라가며 순서 복원
+        t = int(np.argmin(dp[full] + self.cost[nodes, 0]))
+        mask = full
+        path = []
+        while True:
+            path.append(int(nodes[t]))
+            prevMask = mask & ~int(bit[t])
+            if prevMask == 0:
+                break
+            t = int(np.argmin(dp[prevMask] + cost[:, t]))
+            mask = prevMask
+        return [0] + path[::-1]
+
+    # 지금 나가는 도시에서 가장 가까운 (군집, 방향) 으로 계속 이동
+    def nearestNeighbor(self):
+        visited = np.zeros(2 * self.m, dtype=bool)
+        visited[0:2] = True
+        nodes = [0]
+        for _ in range(self.m - 1):
+            row = np.where(visited, np.inf, self.cost[nodes[-1]])
+            node = int(np.argmin(row))
+            nodes.append(node)
+            visited[node - node % 2:node - node % 2 + 2] = True
+        return nodes
+
+    # 군집 구간 i ~ j 를 뒤집으면서 방향도 바꾸기 (i == j 면 방향만 바꾸기)
+    # i 마다 모든 j 의 이득을 한 번에 계산한다
+    def twoOpt(self, nodes):
+        nodes = np.array(nodes)
+        m = len(nodes)
+        cost = self.cost
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, m):
+                j = np.arange(i, m)
+                after = nodes[(j + 1) % m]
+                old = cost[nodes[i - 1], nodes[i]] + cost[nodes[j], after]
+                new = cost[nodes[i - 1], nodes[j] ^ 1] + cost[nodes[i] ^ 1, after]
+                delta = new - old
+                best = int(np.argmin(delta))
+                if delta[best] < -EPSILON:
+                    end = i + best
+                    nodes[i:end + 1] = nodes[i:end + 1][::-1] ^ 1
+                    improved = True
+        return nodes.tolist()
@@ -0,0 +1,207 @@
+import math
+import random
+import numpy as np
+from Neighbor import nearestNeighbors
+
+
+# 간선 조립 교차 (Edge Assembly Crossover)
+# 두 부모에서 한쪽에만 있는 간선들을 A, B 번갈아 따라가며 AB-cycle 로 나누고,
+# AB-cycle 하나의 A 간선을 빼고 B 간선을 넣어 부모 A 를 고친다 (EAX-1AB)
+# 그렇게 생긴 부분 여행들은 가장 작은 것부터 k 최근접 이웃 후보 중 가장 싼 2-간선 교환으로 합친다
+# children 개의 AB-cycle 을 시도해서 가장 짧은 자식 하나를 돌려준다
+class EAX:
+    def __init__(self, coordinates, neighbors=8, neighborList=None, children=3):
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        self.coordinates = coordinates
+        self.x = coordinates[:, 0].tolist()
+        self.y = coordinates[:, 1].tolist()
+        if neighborList is None:
+            neighborList = nearestNeighbors(coordinates, neighbors)
+        self.neighbors = np.asarray(neighborList).tolist()
+        self.children = children
+
+    def distance(self, a, b):
+        return math.hypot(self.x[a] - self.x[b], self.y[a] - self.y[b])
+
+    # 도시마다 (앞 도시, 뒤 도시)
+    def links(self, order):
+        size = len(order)
+        link = [None] * len(self.x)
+        for i in range(size):
+            link[order[i]] = [order[i - 1], order[(i + 1) % size]]
+        return link
+
+    # 한쪽 부모에만 있는 간선을 번갈아 따라가서 만든 AB-cycle 리스트
+    # cycle 은 도시 리스트 c, 간선 (c[i], c[i+1]) 은 i 가 짝수면 A 간선, 홀수면 B 간선
+    def abCycles(self, linkA, linkB, cities):
+        restA = {}
+        restB = {}
+        for u in cities:
+            for v in linkA[u]:
+                if v not in linkB[u]:
+                    restA.setdefault(u, []).append(v)
+            for v in linkB[u]:
+                if v not in linkA[u]:
+                    restB.setdefault(u, []).append(v)
+
+        cycles = []
+        for start in cities:
+            while restA.get(start):
+                path = [start]
+                # types[i]: path[i] -> path[i+1] 간선 종류 (0 = A, 1 = B)
+                types = []
+                seen = {start: [0]}
+                current = start
+                kind = 0
+                while True:
+                    rest = restA if kind == 0 else restB
+                    candidates = rest[current]
+                    following = candidates.pop(random.randrange(len(candidates)))
+                    rest[following].remove(current)
+                    types.append(kind)
+                    path.append(following)
+
+                    # 종류가 다른 간선으로 떠났던 같은 도시로 돌아오면 cycle 완성
+                    closing = None
+                    for j in seen.get(following, ()):
+                        if types[j] != kind:
+                            closing = j
+                            break
+                    if closing is None:
+                        seen.setdefault(following, []).append(len(path) - 1)
+                        current = following
+                        kind = 1 - kind
+                        continue
+
+                    cycle = path[closing:-1]
+                    if types[closing] == 1:
+                        cycle = cycle[1:] + cycle[:1]
+                    cycles.append(cycle)
+                    for index in range(closing + 1, len(path) - 1):
+                        seen[path[index]].remove(index)
+                    del path[closing + 1:]
+                    del types[closing:]
+                    if closing == 0:
+                        break
+                    current = following
+                    kind = 1 - types[-1]
+        return cycles
+
+    # linkA 를 복사해서 cycle 의 A 간선을 빼고 B 간선을 넣는다, (새 link, 늘어난 길이)
+    def applyCycle(self, linkA, cycle):
+        link = [None if pair is None else list(pair) for pair in linkA]
+        size = len(cycle)
+        delta = 0.0
+        for i in range(0, size, 2):
+            u, v = cycle[i], cycle[(i + 1) % size]
+            link[u].remove(v)
+            link[v].remove(u)
+            delta -= self.distance(u, v)
+        for i in range(1, size, 2):
+            u, v = cycle[i], cycle[(i + 1) % size]
+            link[u].append(v)
+            link[v].append(u)
+            delta += self.distance(u, v)
+        return link, delta
+
+    # 차수 2 그래프의 부분 여행들을 하나로 합친다, 늘어난 길이 리턴
+    def mergeSubtours(self, link, cities):
+        label = {}
+        subtours = {}
+        for start in cities:
+            if start in label:
+                continue
+            members = []
+            previous, current = -1, start
+            while current not in label:
+                label[current] = start
+                members.append(current)
+                following = link[current][0] if link[current][0] != previous else link[current][1]
+                previous, current = current, following
+            subtours[start] = members
+
+        delta = 0.0
+        while len(subtours) > 1:
+            smallest = min(subtours, key=lambda key: len(subtours[key]))
+            best = self.bestJoin(link, label, smallest, subtours[smallest], self.neighbors)
+            if best is None:
+                # 이웃 후보가 모두 같은 부분 여행 안에 있으면 밖에서 가장 가까운 도시를 후보로 쓴다
+                outside = [city for city in cities if label[city] != smallest]
+                best = self.bestJoin(link, label, smallest, subtours[smallest],
+                                     self.nearestOutside(subtours[smallest], outside))
+            cost, u, u2, v, v2 = best
+            link[u].remove(u2)
+            link[u2].remove(u)
+            link[v].remove(v2)
+            link[v2].remove(v)
+            link[u].append(v)
+            link[v].append(u)
+            link[u2].append(v2)
+            link[v2].append(u2)
+            delta += cost
+
+            target = label[v]
+            for city in subtours[smallest]:
+                label[city] = target
+            subtours[target].extend(subtours.pop(smallest))
+        return delta
+
+    # members 도시마다 outside 중 가장 가까운 도시 하나 (도시 -> [도시])
+    def nearestOutside(self, members, outside, block=1 << 22):
+        xy = self.coordinates
+        outside = np.asarray(outside)
+        rows = max(1, block // len(outside))
+        candidates = {}
+        for start in range(0, len(members), rows):
+            chunk = np.asarray(members[start:start + rows])
+            distance = np.hypot(xy[chunk, 0, None] - xy[outside, 0], xy[chunk, 1, None] - xy[outside, 1])
+            for u, v in zip(chunk.tolist(), outside[distance.argmin(axis=1)].tolist()):
+                candidates[u] = [v]
+        return candidates
+
+    # 부분 여행 members 의 간선 (u, u2) 와 후보 도시 v 의 간선 (v, v2) 를 바꿔 잇는 가장 싼 방법
+    # (늘어난 길이, u, u2, v, v2), 새 간선은 u-v, u2-v2
+    def bestJoin(self, link, label, smallest, members, candidates):
+        best = None
+        for u in members:
+            for v in candidates[u]:
+                if label[v] == smallest:
+                    continue
+                dUV = self.distance(u, v)
+                for u2 in link[u]:
+                    for v2 in link[v]:
+                        cost = dUV + self.distance(u2, v2) - self.distance(u, u2) - self.distance(v, v2)
+                        if best is None or cost < best[0]:
+                            best = (cost, u, u2, v, v2)
+                        # 반대 방향 (u-v2, u2-v) 은 v2 쪽에서 보는 것과 같지만 v2 가 후보에 없을 수 있다
+                        cost = self.distance(u, v2) + self.distance(u2, v) - self.distance(u, u2) - self.distance(v, v2)
+                        if cost < best[0]:
+                            best = (cost, u, u2, v2, v)
+        return best
+
+    # 부모 순서 first (A), second (B) 로 (자식 순서, first 보다 늘어난 길이)
+    # 자식도 first 의 첫 도시로 시작
+    def cross(self, first, second):
+        first = np.asarray(first).tolist()
+        second = np.asarray(second).tolist()
+        linkA = self.links(first)
+        linkB = self.links(second)
+        cycles = self.abCycles(linkA, linkB, first)
+        if not cycles:
+            return np.array(first, dtype=np.int32), 0.0
+
+        best = None
+        for cycle in random.sample(cycles, min(self.children, len(cycles))):
+            link, delta = self.applyCycle(linkA, cycle)
+            delta += self.mergeSubtours(link, first)
+            if best is None or delta < best[1]:
+                best = (link, delta)
+
+        link, delta = best
+        order = [first[0]]
+        previous, current = -1, first[0]
+        for i in range(len(first) - 1):
+            following = link[current][0] if link[current][0] != previous else link[current][1]
+            order.append(following)
+            previous, current = current, following
+        return np.array(order, dtype=np.int32), delta
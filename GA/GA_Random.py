@@ -1,68 +1,154 @@
 # 유전 알고리즘으로 TSP 문제 풀기
 # roulettewheelSelection, orderCrossover, swapMutate
 
+import os
 import random
 import csv
-import matplotlib.pyplot as plt
-from City import City
-from City import TourManager
+import numpy as np
 from City import Tour
 from City import Population
-from Random import tour
+from City import EvaluationCounter
+from Seeding import parseMix
+from CityStore import loadTourManager
+from Cli import gaParser
+from Cli import parseArgs
+from Cli import seedAll
+from Cli import matrixDtype
+from Cli import askInt
+from Checkpoint import savePopulation
+from Checkpoint import loadPopulation
+from Metrics import Metrics
+from Metrics import printRecord
+from Plot import showTour
+from Selection import RouletteWheel
+from TwoOpt import TwoOpt
+from EAX import EAX
 
 # 유전 알고리즘 클래스
+# localSearch: None, 'elite'(엘리트만), 'child'(모든 자식) 에 2-opt 지역 탐색 적용
+# selection, crossover, mutation 은 아래 표의 이름으로 고른다
 class GA:
-    def __init__(self, tourmanager, mutationRate=0.1, tournamentSize=30, elitism=True):
+    SELECTIONS = {'roulette': 'rouletteSelection', 'tournament': 'tournamentSelection',
+                  'ranking': 'rankingSelecton', 'elit': 'elitSelection'}
+    CROSSOVERS = {'order': 'orderCrossover', 'frontOrder': 'frontOrderCrossover',
+                  'pmx': 'PMXCrossover', 'cycle': 'cycleCrossover', 'eax': 'EAXCrossover'}
+    MUTATIONS = {'swap': 'swapMutate', 'inversion': 'inversionMutate', 'neighborSwap': 'neighborSwapMutate',
+                 'neighborInsertion': 'neighborInsertionMutate', 'neighborInversion': 'neighborInversionMutate'}
+
+    def __init__(self, tourmanager, mutationRate=0.1, tournamentSize=30, elitism=True, localSearch=None, metrics=None,
+                 selection='roulette', crossover='order', mutation='swap'):
         self.tourmanager = tourmanager
         self.mutationRate = mutationRate
         self.tournamentSize = tournamentSize
         self.elitism = elitism
+        self.localSearch = localSearch
+        self.twoOpt = None
+        self.eax = None
+        if selection not in self.SELECTIONS:
+            raise ValueError('unknown selection: ' + str(selection))
+        if crossover not in self.CROSSOVERS:
+            raise ValueError('unknown crossover: ' + str(crossover))
+        if mutation not in self.MUTATIONS:
+            raise ValueError('unknown mutation: ' + str(mutation))
+        self.selection = selection
+        self.select = getattr(self, self.SELECTIONS[selection])
+        self.crossover = getattr(self, self.CROSSOVERS[crossover])
+        self.mutate = getattr(self, self.MUTATIONS[mutation])
+        # 세대별 기록 (Metrics), None 이면 재지 않음
+        self.metrics = metrics
 
     # 인구 클래스 진화 과정
     def evolvePopulation(self, pop):
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.startGeneration()
         newPopulation = Population(self.tourmanager, pop.populationSize(), False)
 
         elitismOffset = 0
         if self.elitism:
-            newPopulation.saveTour(0, pop.getFittest())
+            elite = pop.getFittest()
+            if metrics is not None:
+                metrics.mark('evaluation')
+            if self.localSearch == 'elite':
+                elite = self.getTwoOpt().improveTour(elite.copy())
+            newPopulation.saveTour(0, elite)
             elitismOffset = 1
+            if metrics is not None:
+                metrics.mark('localSearch')
 
+        parents = self.selectParents(pop, 2 * (newPopulation.populationSize() - elitismOffset))
+        if metrics is not None:
+            metrics.mark('selection')
         for i in range(elitismOffset, newPopulation.populationSize()):
-            parent1 = self.rouletteSelection(pop)
-            parent2 = self.rouletteSelection(pop)
-            child = self.orderCrossover(parent1, parent2)
+            parent1 = parents[2 * (i - elitismOffset)]
+            parent2 = parents[2 * (i - elitismOffset) + 1]
+            child = self.crossover(parent1, parent2)
             newPopulation.saveTour(i, child)
+        if metrics is not None:
+            metrics.mark('crossover')
 
+        # 길이를 들고 오는 자식 (EAX) 만 변이 거리를 간선 차이로 갱신, 나머지는 evaluate 에서 계산
         for i in range(elitismOffset, newPopulation.populationSize()):
-            self.swapMutate(newPopulation.getTour(i))
+            self.mutate(newPopulation.getTour(i))
+        if metrics is not None:
+            metrics.mark('mutation')
 
+        if self.localSearch == 'child':
+            for i in range(elitismOffset, newPopulation.populationSize()):
+                self.getTwoOpt().improveTour(newPopulation.getTour(i))
+
+        if metrics is not None:
+            metrics.mark('localSearch')
+            metrics.endGeneration(newPopulation)
         return newPopulation
 
+    # 부모 count 명 고르기
+    # 룰렛 휠은 세대마다 한 번 만들고 부모 index 를 한 번에 뽑는다
+    # 순위 선택은 상위 5 개 순위를 한 번만 읽고 모든 부모를 거기서 뽑는다
+    def selectParents(self, pop, count):
+        if self.selection == 'roulette':
+            return [pop.getTour(i) for i in self.getRouletteWheel(pop).draw(count).tolist()]
+        if self.selection == 'ranking':
+            highest_chrom_idx = self.getSortedFitnessIndex(pop)
+            return [pop.getTour(highest_chrom_idx[self.rankingPick()]) for i in range(count)]
+        return [self.select(pop) for i in range(count)]
+
+    # tourmanager 의 좌표와 이웃 목록으로 만든 2-opt 엔진
+    def getTwoOpt(self):
+        if self.twoOpt is None:
+            self.twoOpt = TwoOpt(self.tourmanager.getCoordinates(), neighborList=self.tourmanager.getNeighbors())
+        return self.twoOpt
+
+    # tourmanager 의 좌표와 이웃 목록으로 만든 간선 조립 교차 엔진
+    def getEAX(self):
+        if self.eax is None:
+            self.eax = EAX(self.tourmanager.getCoordinates(), neighborList=self.tourmanager.getNeighbors())
+        return self.eax
+
     # 크로스오버 순서교차
+    # 시작 도시는 parent2[0] 으로 고정, parent1 구간은 같은 위치에 복사하고
+    # 남은 자리(구간 뒤 -> 앞)는 parent2 순서대로 채운다. 방문 표시 배열로 O(n)
     def orderCrossover(self, parent1, parent2):
-        child = Tour(self.tourmanager)
+        first = parent1.getOrder()
+        second = parent2.getOrder()
+        size = len(first)
 
         startPos = int(random.randint(1, parent1.tourSize()-1))
         endPos = int(random.randint(startPos + 1, parent2.tourSize()))
 
-        for i in range(0, child.tourSize()):
-            if i >= startPos and i <= endPos:
-                child.setCity(i, parent1.getCity(i))
+        order = np.empty(size, dtype=np.int32)
+        order[0] = second[0]
+        order[startPos:endPos+1] = first[startPos:endPos+1]
 
-        for i in range(endPos+1, child.tourSize()):
-            for j in range(1, child.tourSize()):
-                if not child.containsCity(parent2.getCity(j)):
-                    child.setCity(i, parent2.getCity(j))
-                    break
-        for i in range(0, startPos):
-            for j in range(1, child.tourSize()):
-                if i == 0:
-                    child.setCity(0, parent2.getCity(0))
-                    break
-                if not child.containsCity(parent2.getCity(j)):
-                    child.setCity(i, parent2.getCity(j))
-                    break
-        return child
+        visited = np.zeros(self.tourmanager.numberOfCities(), dtype=bool)
+        visited[first[startPos:endPos+1]] = True
+        visited[second[0]] = True
+        rest = second[1:][~visited[second[1:]]]
+
+        back = max(size - endPos - 1, 0)
+        order[endPos+1:] = rest[:back]
+        order[1:startPos] = rest[back:]
+        return Tour(self.tourmanager, order)
 
     def frontOrderCrossover(self, parent1, parent2):
         child = Tour(self.tourmanager)
@@ -85,82 +171,109 @@ class GA:
                         break
         return child
 
+    # 부분 사상 교차: parent1 구간의 도시 -> 구간 위치 표로 중복 도시를 바로 따라간다, O(n)
     def PMXCrossover(self, parent1, parent2):
-        child = Tour(self.tourmanager)
+        first = parent1.getOrder()
+        second = parent2.getOrder()
 
         startPos = random.randint(1, parent1.tourSize() - 2)
         endPos = random.randint(startPos + 1, parent2.tourSize() - 1)
 
-        for i in range(0, child.tourSize()):
-            if i >= startPos and i <= endPos:
-                child.setCity(i, parent1.getCity(i))
-
-        for i in range(0, child.tourSize()):
-            if i < startPos or i > endPos:
-                child.setCity(i, parent2.getCity(i))
-
-        duplicate = True
-        while duplicate:
-            duplicate = False
-            target = child[startPos:endPos+1]
-            for i in range(0, startPos):
-                if child[i] in target:
-                    duplicate = True
-                    for j in range(startPos, endPos+1):
-                        if child.getCity(i) == child.getCity(j):
-                            child.setCity(i, parent2.getCity(j))
-                            break
-
-            #target = child[:endPos+1]
-            for i in range(endPos+1, parent2.tourSize()):
-                if child[i] in target:
-                    duplicate = True
-                    for j in range(startPos, endPos+1):
-                        if child.getCity(i) == child.getCity(j):
-                            child.setCity(i, parent2.getCity(j))
-                            break
+        order = second.copy()
+        order[startPos:endPos+1] = first[startPos:endPos+1]
+
+        segment = np.full(self.tourmanager.numberOfCities(), -1, dtype=np.int32)
+        segment[first[startPos:endPos+1]] = np.arange(startPos, endPos+1, dtype=np.int32)
+
+        # 구간 밖에서 구간 도시와 겹치는 자리만 사상을 따라가 바꾼다
+        outside = np.ones(len(order), dtype=bool)
+        outside[startPos:endPos+1] = False
+        duplicate = np.flatnonzero(outside & (segment[second] >= 0))
+        segmentList = segment.tolist()
+        secondList = second.tolist()
+        for i in duplicate.tolist():
+            city = secondList[i]
+            while segmentList[city] >= 0:
+                city = secondList[segmentList[city]]
+            order[i] = city
+        return Tour(self.tourmanager, order)
+
+    # 간선 조립 교차: parent1 에 AB-cycle 하나의 parent2 간선을 넣고 부분 여행을 합친다 (EAX.py)
+    # 거리는 parent1 거리에 바뀐 간선 길이만 더한다
+    def EAXCrossover(self, parent1, parent2):
+        order, delta = self.getEAX().cross(parent1.getOrder(), parent2.getOrder())
+        child = Tour(self.tourmanager, order)
+        child.distance = parent1.getDistance() + delta
+        EvaluationCounter.deltas += 1
         return child
 
+    # 사이클 교차: parent1 위치 표로 사이클을 따라가며 부모를 번갈아 복사, O(n)
     def cycleCrossover(self, parent1, parent2):
-        child = Tour(self.tourmanager)
-        ind = 0
-        first, second = parent1, parent2
-
-        while True:
-            if child.getCount() == 0:
-                break
-            child[ind] = first[ind]
-            ind = first.getIndex(second[ind])
-            #print(ind)
-            if child[ind] != None and child.getCount() != 0:
-                first, second = second, first
-                ind = child.getIndex(None)
-        return child
-
-    # 변이(도시 위치 서로 바꾸기)
+        first = parent1.getOrder().tolist()
+        second = parent2.getOrder().tolist()
+        position = parent1.getPositions().tolist()
+
+        order = [-1] * len(first)
+        source = first
+        for start in range(0, len(order)):
+            if order[start] >= 0:
+                continue
+            ind = start
+            while order[ind] < 0:
+                order[ind] = source[ind]
+                ind = position[second[ind]]
+            source = second if source is first else first
+        return Tour(self.tourmanager, np.array(order, dtype=np.int32))
+
+    # 변이(도시 위치 서로 바꾸기), 거리는 바뀐 간선만 다시 계산
     def swapMutate(self, tour):
         for tourPos1 in range(1, tour.tourSize()):
             if random.random() < self.mutationRate:
                 tourPos2 = int(tour.tourSize() * random.uniform(0.05, 1))
-                city1 = tour.getCity(tourPos1)
-                city2 = tour.getCity(tourPos2)
-                tour.setCity(tourPos2, city1)
-                tour.setCity(tourPos1, city2)
+                tour.swapCities(tourPos1, tourPos2)
 
+    # 변이(구간 뒤집기), 거리는 양 끝 간선만 다시 계산
     def inversionMutate(self, tour):
         startPos = random.randint(1, tour.tourSize() - 2)
         endPos = random.randint(startPos + 1, tour.tourSize() - 1)
+        tour.reverseSegment(startPos, endPos)
+
+    # 도시 하나와 tourmanager 의 가까운 이웃 목록 (k 개) 에서 고른 이웃 도시의 위치
+    # 시작 도시 0 은 움직이지 않으므로 이웃이 0 이면 None
+    def pickNeighbor(self, tour, tourPos):
+        neighbors = self.tourmanager.getNeighbors()
+        neighbor = int(neighbors[tour.getOrder()[tourPos], random.randrange(neighbors.shape[1])])
+        if neighbor == 0:
+            return None
+        return int(tour.getPositions()[neighbor])
+
+    # 변이(도시 다음 자리와 가까운 이웃 바꾸기), 이웃이 바로 뒤에 오게 된다
+    def neighborSwapMutate(self, tour):
+        size = tour.tourSize()
+        for tourPos1 in range(1, size - 1):
+            if random.random() < self.mutationRate:
+                tourPos2 = self.pickNeighbor(tour, tourPos1)
+                if tourPos2 is not None:
+                    tour.swapCities(tourPos1 + 1, tourPos2)
 
-        child = Tour(self.tourmanager)
-        tmp = 0
-        for i in range(startPos, endPos+1):
-            for j in range(endPos - tmp, startPos-1, -1):
-                child.setCity(i, tour.getCity(j))
-                tmp += 1
-                break
-
-        for i in range(startPos, endPos+1):
-            tour.setCity(i, child.getCity(i))
+    # 변이(도시를 빼서 가까운 이웃 바로 뒤에 끼워 넣기), 거리는 바뀐 간선 6개만 다시 계산
+    def neighborInsertionMutate(self, tour):
+        for tourPos1 in range(1, tour.tourSize()):
+            if random.random() < self.mutationRate:
+                tourPos2 = self.pickNeighbor(tour, tourPos1)
+                if tourPos2 is not None:
+                    tour.moveCity(tourPos1, tourPos2 if tourPos1 < tourPos2 else tourPos2 + 1)
+
+    # 변이(구간 뒤집기로 도시와 가까운 이웃을 잇기, 2-opt 이동 하나)
+    def neighborInversionMutate(self, tour):
+        tourPos1 = random.randint(1, tour.tourSize() - 1)
+        tourPos2 = self.pickNeighbor(tour, tourPos1)
+        if tourPos2 is None:
+            return
+        if tourPos1 < tourPos2:
+            tour.reverseSegment(tourPos1 + 1, tourPos2)
+        else:
+            tour.reverseSegment(tourPos2 + 1, tourPos1)
 
     # 토너먼트 셀렉션
     def tournamentSelection(self, pop):
@@ -187,24 +300,21 @@ class GA:
 
     def rankingSelecton(self, pop):
         highest_chrom_idx = self.getSortedFitnessIndex(pop)
+        return pop.getTour(highest_chrom_idx[self.rankingPick()])
+
+    # 상위 5 개 중 몇 번째를 고를지 (0.5, 0.2, 0.15, 0.1, 0.05 확률)
+    def rankingPick(self):
         prob_list = [0.5, 0.2, 0.15, 0.1, 0.05]
         p = random.random()
         sum = 0
         for i in range(5):
             sum += prob_list[i]
             if sum >= p:
-                idx = i
-                break
-        return pop.getTour(highest_chrom_idx[idx])
+                return i
+        return 4
 
     def getSortedFitnessIndex(self, pop):
-        fitness_list = pop.getFitnessList()
-        sortedFitness = sorted(fitness_list)
-        highest_tour_index = []
-        for i in range(0, 5):
-            highest_fitness = sortedFitness.pop()
-            highest_tour_index.append(fitness_list.index(highest_fitness))
-        return highest_tour_index
+        return pop.getRanks()[:5].tolist()
 
     def elitSelection(self, pop):
         if pop.isElit:
@@ -213,129 +323,72 @@ class GA:
 
         return pop.getTour(int(random.random() * pop.populationSize()))
 
-    def rouletteSelection(self, pop):
-        sum = 0
-        for i in range(pop.populationSize()):
-            sum += pop.getTour(i).getFitness()
-
-        fitnessProb = []
-        for i in range(pop.populationSize()):
-            fitnessProb.append(pop.getTour(i).getFitness() / sum)
-
-        fitnessSum = 0
-        fitness_sumList = []
-        for i in fitnessProb:
-            fitnessSum += i
-            fitness_sumList.append(fitnessSum)
-
-        rand = random.random()
-        for i in range(pop.populationSize()):
-            if rand <= fitness_sumList[i]:
-                #print(pop.getTour(i))
-                return pop.getTour(i)
-        return None
+    def getRouletteWheel(self, pop):
+        if pop.wheel is None:
+            pop.wheel = RouletteWheel(pop.getFitnessArray())
+        return pop.wheel
 
-# 파일 직접 실행시 실행
-if __name__ == '__main__':
-    f = open('../TSP.csv', 'r')
-    reader = csv.reader(f)
-
-    n_cities = 1000
-    population_size = 10
-    n_generations = 50
-    cityCoordinate = []
-    city_x = []
-    city_y = []
-    city_index = []
-
-    i = 1
-    for line in reader:
-        line0 = float(line[0])
-        line1 = float(line[1])
-        city = [line0, line1]
-        cityCoordinate.append(city)
-        city_x.append(line0)
-        city_y.append(line1)
-        city_index.append(i)
-        i += 1
-        if len(cityCoordinate) == n_cities:
-            break
-    f.close()
-
-    cities = []
-    new_cities = []
-    sol = []
-    parentGene = []
-
-    with open('../TSP.csv', mode='r', newline='') as tsp:
-        reader = csv.reader(tsp)
-        i = 0
-        for row in reader:
-            cities.append(City(float(row[0]), float(row[1]), i))
-            i = i + 1
-
-    number = int(input("생성할 부모 gene 수를 입력하시오 :  "))
-    for i in range(number):
-        tournode = tour(cities)
-        tournode.makeOrder(cities)
-        parentGene.append(tournode)
-
-    for i in range(number):
-        k = parentGene[i].total_length
-        last = parentGene[i].cities_order[len(parentGene[i].cities_order) - 1].index
+    def rouletteSelection(self, pop):
+        return pop.getTour(int(self.getRouletteWheel(pop).draw()))
+
+# 명령행 (또는 --config) 옵션으로 실행, 인구 수를 주지 않으면 input() 으로 묻는다
+def main(argv=None):
+    parser = gaParser('Genetic algorithm on random tours', 'solution_ga_random_roulette.csv', GA,
+                      plot='ga_random.png')
+    parser.add_argument('--init', default=None, help='seeding mix, e.g. greedy=1,nearest=4,hilbert=5')
+    args = parseArgs(parser, argv)
+    seedAll(args.seed)
+    n_generations = args.n_generations
+
+    # 좌표는 CityStore 캐시에서 한 번만 읽고, 거리 행렬은 tourmanager 하나가 공유
+    # 거리 행렬은 MATRIX_BYTES 안에 들어갈 때만 미리 만든다 (--float32 면 절반 크기)
+    tourmanager = loadTourManager(args.cities, args.n_cities, matrixDtype(args))
+    n_cities = tourmanager.numberOfCities()
+    cities = tourmanager.destinationCities
+    coordinates = tourmanager.getCoordinates()
+    if tourmanager.useMatrix():
+        tourmanager.buildDistanceMatrix()
+
+    number = askInt(args.population, "생성할 부모 gene 수를 입력하시오 :  ")
+    # Initialize population
+    # 도시 0 으로 시작하는 랜덤 여행 number 개를 한 번에 섞어 만들고 길이도 한 번에 계산
+    # --init 을 주면 그 개수만큼은 힐베르트 곡선 / 가장 가까운 이웃 / 탐욕 간선 여행으로 시작
+    pop = Population(tourmanager, populationSize=number, initialise=False)
+    if args.init:
+        pop.seed(parseMix(args.init))
+    else:
+        pop.randomize()
 
+    # 첫 번째 부모 gene (시작 도시로 돌아오는 순서)
     with open('sample.csv', mode='w', newline='') as sam:
         writer = csv.writer(sam)
-        index_array = []
-        for row in range(len(parentGene[0].cities_order)):
-            index_array.append([parentGene[0].cities_order[row].index])
-            writer.writerow(index_array[row])
-
-    # 도시 수 만큼 랜덤 좌표 설정
-    tourmanager = TourManager()
-    for i in range(n_cities):
-        tourmanager.addCity(City(x=city_x[i], y=city_y[i], index=city_index[i]))
-        plt.scatter(city_x[i], city_y[i], c='grey')
-        plt.axis([0, 100, 0, 100])
-
-    tourList = []
-    for i in range(0, number):
-        tourList.append(parentGene[i].getArray())
-
-    randomTour = []
-    for i in range(0, number):
-        randomTour.append(TourManager())
-
-    for i in range(0, number):
-        randomTour[i].setCity(tourList[i])
-
-    randomTourList = []
-    for i in range(0, number):
-        randomTourList.append(Tour(randomTour[i]))
-        randomTourList[i].generate()
-
-    # Initialize population
-    pop = Population(tourmanager, populationSize=number, initialise=False)
-    for i in range(0, number):
-        pop.saveTour(i, randomTourList[i])
+        for city in pop.getTour(0).getOrder().tolist() + [0]:
+            writer.writerow([city])
 
     print("Initial distance: " + str(pop.getFittest().getDistance()))
 
     # Evolve population
-    ga = GA(tourmanager)
-
-    for i in range(n_generations):
+    # 세대마다 한 줄 요약 출력, --metrics (TSP_METRICS) 에 파일 경로를 주면 JSONL 로도 저장
+    metrics = Metrics(path=args.metrics, callback=printRecord)
+    ga = GA(tourmanager, mutationRate=args.mutation_rate, localSearch=args.local_search, metrics=metrics,
+            selection=args.selection, crossover=args.crossover, mutation=args.mutation)
+
+    # --checkpoint (TSP_CHECKPOINT) 에 파일 경로를 주면 checkpoint_interval 세대마다 저장하고,
+    # 파일이 이미 있으면 저장된 인구와 난수 상태로 그 세대부터 이어서 실행
+    checkpoint = args.checkpoint
+    checkpoint_interval = args.checkpoint_interval
+    start = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        pop, start = loadPopulation(checkpoint, tourmanager)
+        metrics.generation = start
+        print("Resume from generation %d: %s" % (start, str(pop.getFittest().getDistance())))
+
+    for i in range(start, n_generations):
         # population에 대해 유전알고리즘 시행 후 다시 저장
         pop = ga.evolvePopulation(pop)
-
-        # 가장 적합도가 높은 여행
-        fittest = pop.getFittest()
-
-        if i == n_generations - 1:
-            for j in range(1, n_cities):
-                plt.plot([fittest[j].x, fittest[j - 1].x], [fittest[j].y, fittest[j - 1].y], color="blue", linewidth=0.5)
-        print(pop.getFittest())
-        print("Final distance: " + str(pop.getFittest().getDistance()))
+        if checkpoint is not None and (i + 1) % checkpoint_interval == 0:
+            savePopulation(checkpoint, pop, i + 1)
+    metrics.close()
 
     # Print final results
     print("Finished")
@@ -345,11 +398,18 @@ if __name__ == '__main__':
     for i in range(0, n_cities):
         print(pop.getFittest().getCity(i).getIndex(), end=' -> ')
 
-    with open('solution_ga_random_roulette.csv', mode='w', newline='') as sam:
+    with open(args.output, mode='w', newline='') as sam:
         writer = csv.writer(sam)
         index_array = []
         for row in range(n_cities):
             index_array.append([pop.getFittest().getCity(row).getIndex()])
             writer.writerow(index_array[row])
 
-    plt.show()
\ No newline at end of file
+    # 도시는 scatter 하나, 여행은 LineCollection 하나로 그린다 (headless 면 PNG 로 저장)
+    showTour(coordinates, [pop.getFittest().getOrder()], path=args.plot, closed=False,
+             cityColor='grey', axis=[0, 100, 0, 100])
+
+
+# 파일 직접 실행시 실행
+if __name__ == '__main__':
+    main()
@@ -1,318 +1,72 @@
 # 유전알고리즘 + 트리로 TSP 문제 풀기
 
-import random
+import os
 import csv
-import matplotlib.pyplot as plt
-from City import City
-from City import TourManager
 from City import Tour
 from City import Population
+from CityStore import loadTourManager
+from Cli import gaParser
+from Cli import parseArgs
+from Cli import seedAll
+from Cli import matrixDtype
+from Cli import askInt
+from Checkpoint import savePopulation
+from Checkpoint import loadPopulation
+from Metrics import Metrics
+from Metrics import printRecord
+from Plot import showTour
 from dfs import tour
-
-# 유전 알고리즘 클래스
-class GA:
-    def __init__(self, tourmanager, mutationRate=0.1, tournamentSize=30, elitism=True):
-        self.tourmanager = tourmanager
-        self.mutationRate = mutationRate
-        self.tournamentSize = tournamentSize
-        self.elitism = elitism
-
-    # 인구 클래스 진화 과정
-    def evolvePopulation(self, pop):
-        newPopulation = Population(self.tourmanager, pop.populationSize(), False)
-
-        elitismOffset = 0
-        if self.elitism:
-            newPopulation.saveTour(0, pop.getFittest())
-            elitismOffset = 1
-
-        for i in range(elitismOffset, newPopulation.populationSize()):
-            parent1 = self.rouletteSelection(pop)
-            parent2 = self.rouletteSelection(pop)
-            child = self.cycleCrossover(parent1, parent2)
-            newPopulation.saveTour(i, child)
-
-        for i in range(elitismOffset, newPopulation.populationSize()):
-            self.swapMutate(newPopulation.getTour(i))
-
-        return newPopulation
-
-    # 크로스오버 순서교차
-    def orderCrossover(self, parent1, parent2):
-        child = Tour(self.tourmanager)
-
-        startPos = int(random.randint(1, parent1.tourSize()-1))
-        endPos = int(random.randint(startPos + 1, parent2.tourSize()))
-
-        for i in range(0, child.tourSize()):
-            if i >= startPos and i <= endPos:
-                child.setCity(i, parent1.getCity(i))
-
-        for i in range(endPos+1, child.tourSize()):
-            for j in range(1, child.tourSize()):
-                if not child.containsCity(parent2.getCity(j)):
-                    child.setCity(i, parent2.getCity(j))
-                    break
-        for i in range(0, startPos):
-            for j in range(1, child.tourSize()):
-                if i == 0:
-                    child.setCity(0, parent2.getCity(0))
-                    break
-                if not child.containsCity(parent2.getCity(j)):
-                    child.setCity(i, parent2.getCity(j))
-                    break
-        return child
-
-    def frontOrderCrossover(self, parent1, parent2):
-        child = Tour(self.tourmanager)
-
-        startPos = int(random.random() * parent1.tourSize())
-        endPos = int(random.random() * parent1.tourSize())
-
-        for i in range(0, child.tourSize()):
-            if startPos < endPos and i > startPos and i < endPos:
-                child.setCity(i, parent1.getCity(i))
-            elif startPos > endPos:
-                if not (i < startPos and i > endPos):
-                    child.setCity(i, parent1.getCity(i))
-
-        for i in range(0, parent2.tourSize()):
-            if not child.containsCity(parent2.getCity(i)):
-                for ii in range(0, child.tourSize()):
-                    if child.getCity(ii) == None:
-                        child.setCity(ii, parent2.getCity(i))
-                        break
-        return child
-
-    def PMXCrossover(self, parent1, parent2):
-        child = Tour(self.tourmanager)
-
-        startPos = random.randint(1, parent1.tourSize() - 2)
-        endPos = random.randint(startPos + 1, parent2.tourSize() - 1)
-
-        for i in range(0, child.tourSize()):
-            if i >= startPos and i <= endPos:
-                child.setCity(i, parent1.getCity(i))
-
-        for i in range(0, child.tourSize()):
-            if i < startPos or i > endPos:
-                child.setCity(i, parent2.getCity(i))
-
-        duplicate = True
-        while duplicate:
-            duplicate = False
-            target = child[startPos:endPos+1]
-            for i in range(0, startPos):
-                if child[i] in target:
-                    duplicate = True
-                    for j in range(startPos, endPos+1):
-                        if child.getCity(i) == child.getCity(j):
-                            child.setCity(i, parent2.getCity(j))
-                            break
-            for i in range(endPos+1, parent2.tourSize()):
-                if child[i] in target:
-                    duplicate = True
-                    for j in range(startPos, endPos+1):
-                        if child.getCity(i) == child.getCity(j):
-                            child.setCity(i, parent2.getCity(j))
-                            break
-        return child
-
-    def cycleCrossover(self, parent1, parent2):
-        child = Tour(self.tourmanager)
-        ind = 0
-        first, second = parent1, parent2
-
-        while True:
-            if child.getCount() == 0:
-                break
-            child[ind] = first[ind]
-            ind = first.getIndex(second[ind])
-            #print(ind)
-            if child[ind] != None and child.getCount() != 0:
-                first, second = second, first
-                ind = child.getIndex(None)
-        return child
-
-    # 변이(도시 위치 서로 바꾸기)
-    def swapMutate(self, tour):
-        for tourPos1 in range(1, tour.tourSize()):
-            if random.random() < self.mutationRate:
-                tourPos2 = int(tour.tourSize() * random.uniform(0.05, 1))
-
-                city1 = tour.getCity(tourPos1)
-                city2 = tour.getCity(tourPos2)
-
-                tour.setCity(tourPos2, city1)
-                tour.setCity(tourPos1, city2)
-
-    def inversionMutate(self, tour):
-        startPos = random.randint(1, tour.tourSize() - 2)
-        endPos = random.randint(startPos + 1, tour.tourSize() - 1)
-
-        child = Tour(self.tourmanager)
-        tmp = 0
-        for i in range(startPos, endPos+1):
-            for j in range(endPos - tmp, startPos-1, -1):
-                child.setCity(i, tour.getCity(j))
-                tmp += 1
-                break
-
-        for i in range(startPos, endPos+1):
-            tour.setCity(i, child.getCity(i))
-
-    # 토너먼트 셀렉션
-    def tournamentSelection(self, pop):
-        t = 0.6
-        n = 3
-        tournament = []
-        for i in range(0, 2**n):
-            tournament.append(random.randint(0, pop.populationSize()-1))
-
-        for i in reversed(range(1, n+1)):
-            for j in range(0, 2**(i-1)):
-                randomId = random.random()
-                if t > randomId:
-                    if pop.getTour(2*j).getFitness() > pop.getTour(2*j+1).getFitness():
-                        tournament[j] = tournament[2*j]
-                    else:
-                        tournament[j] = tournament[2*j+1]
-                else:
-                    if pop.getTour(2*j).getFitness() < pop.getTour(2*j+1).getFitness():
-                        tournament[j] = tournament[2*j]
-                    else:
-                        tournament[j] = tournament[2*j+1]
-        return pop.getTour(tournament[0])
-
-        # 좀 이상한 토너먼트(좋음)
-        # tournament = Population(self.tourmanager, self.tournamentSize, False)
-        # for i in range(0, self.tournamentSize):
-        #     randomId = int(random.random() * pop.populationSize())
-        #     tournament.saveTour(i, pop.getTour(randomId))
-        # fittest = tournament.getFittest()
-        # return fittest
-
-    def rankingSelecton(self, pop):
-        highest_chrom_idx = self.getSortedFitnessIndex(pop)
-        prob_list = [0.5, 0.2, 0.15, 0.1, 0.05]
-        p = random.random()
-        sum = 0
-        for i in range(5):
-            sum += prob_list[i]
-            if sum >= p:
-                idx = i
-                break
-        return pop.getTour(highest_chrom_idx[idx])
-
-    def getSortedFitnessIndex(self, pop):
-        fitness_list = pop.getFitnessList()
-        sortedFitness = sorted(fitness_list)
-        highest_tour_index = []
-        for i in range(0, 5):
-            highest_fitness = sortedFitness.pop()
-            highest_tour_index.append(fitness_list.index(highest_fitness))
-        return highest_tour_index
-
-    def elitSelection(self, pop):
-        if pop.isElit:
-            pop.saveTour(int(random.random() * pop.populationSize()), pop.elit)
-        pop.setElit()
-
-        return pop.getTour(int(random.random() * pop.populationSize()))
-
-    def rouletteSelection(self, pop):
-        sum = 0
-        for i in range(pop.populationSize()):
-            sum += pop.getTour(i).getFitness()
-
-        fitnessProb = []
-        for i in range(pop.populationSize()):
-            fitnessProb.append(pop.getTour(i).getFitness() / sum)
-
-        fitnessSum = 0
-        fitness_sumList = []
-        for i in fitnessProb:
-            fitnessSum += i
-            fitness_sumList.append(fitnessSum)
-
-        rand = random.random()
-        for i in range(pop.populationSize()):
-            if rand <= fitness_sumList[i]:
-                return pop.getTour(i)
-        return None
-
-# 파일 직접 실행시 실행
-if __name__ == '__main__':
-    f = open('../TSP.csv', 'r')
-    reader = csv.reader(f)
-
-    n_cities = 1000
-    population_size = 10
-    n_generations = 10
-    cityCoordinate = []
-    city_x = []
-    city_y = []
-    city_index = []
-
-    i = 1
-    for line in reader:
-        line0 = float(line[0])
-        line1 = float(line[1])
-        city = [line0, line1]
-        cityCoordinate.append(city)
-        city_x.append(line0)
-        city_y.append(line1)
-        city_index.append(i)
-        i += 1
-        if len(cityCoordinate) == n_cities:
-            break
-    f.close()
-
-    cities = []
-    new_cities = []
-    sol = []
+from Spatial import GridIndex
+import GA_Random
+
+# 유전 알고리즘 클래스는 GA_Random.GA 를 그대로 쓰고 기본 교차만 사이클 교차
+class GA(GA_Random.GA):
+    def __init__(self, tourmanager, mutationRate=0.1, tournamentSize=30, elitism=True, localSearch=None, metrics=None,
+                 selection='roulette', crossover='cycle', mutation='swap'):
+        GA_Random.GA.__init__(self, tourmanager, mutationRate=mutationRate, tournamentSize=tournamentSize,
+                              elitism=elitism, localSearch=localSearch, metrics=metrics, selection=selection,
+                              crossover=crossover, mutation=mutation)
+
+
+# 명령행 (또는 --config) 옵션으로 실행, 인구 수를 주지 않으면 input() 으로 묻는다
+def main(argv=None):
+    parser = gaParser('Genetic algorithm on dfs cluster tours', 'ga_tree.csv', GA, plot='ga_tree.png',
+                      crossover='cycle')
+    parser.add_argument('--clusters', type=int, default=None, help='number of dfs clusters')
+    args = parseArgs(parser, argv)
+    seedAll(args.seed)
+    n_generations = args.n_generations
     parentGene = []
 
-    i = 0
-    with open('../TSP.csv', mode='r', newline='') as tsp:
-        reader = csv.reader(tsp)
-        i = 0
-        for row in reader:
-            cities.append(City(float(row[0]), float(row[1]), i))
-            i = i + 1
+    # 좌표는 CityStore 캐시에서 한 번만 읽고, 거리 행렬은 tourmanager 하나가 공유
+    # 거리 행렬은 MATRIX_BYTES 안에 들어갈 때만 미리 만든다 (--float32 면 절반 크기)
+    tourmanager = loadTourManager(args.cities, args.n_cities, matrixDtype(args))
+    n_cities = tourmanager.numberOfCities()
+    cities = tourmanager.destinationCities
+    coordinates = tourmanager.getCoordinates()
+    if tourmanager.useMatrix():
+        tourmanager.buildDistanceMatrix()
 
-    number = int(input("생성할 부모 gene 수를 입력하시오 :  "))
-    cluster_number = int(input("생성할 군집의 수를 입력하시오 :  "))
+    number = askInt(args.population, "생성할 부모 gene 수를 입력하시오 :  ")
+    cluster_number = askInt(args.clusters, "생성할 군집의 수를 입력하시오 :  ")
 
+    # 부모 gene 마다 격자 색인을 다시 만들지 않고 복사해서 쓴다
+    cityIndex = GridIndex(tourmanager.getCoordinates())
     for i in range(number):
-        tournode = tour(cities, cluster_number)
+        tournode = tour(cities, cluster_number, tourmanager, index=cityIndex)
         parentGene.append(tournode)
     print(len(parentGene[0].getArray()))
 
-    # 도시 수 만큼 랜덤 좌표 설정
-    tourmanager = TourManager()
-    for i in range(n_cities):
-        tourmanager.addCity(City(x=city_x[i], y=city_y[i], index=city_index[i]))
-        plt.scatter(city_x[i], city_y[i], c='lightblue')
-        plt.axis([0, 100, 0, 100])
-
     tourList = []
     for i in range(0, number):
         tourList.append(parentGene[i].getArray())
     print(parentGene[0].getArray())
     print(parentGene[1].getArray())
 
-    randomTour = []
-    for i in range(0, number):
-        randomTour.append(TourManager())
-
-    for i in range(0, number):
-        randomTour[i].setCity(tourList[i])
-
+    # 마지막에 다시 넣은 시작 도시는 빼고 같은 tourmanager 의 여행으로 만든다
     randomTourList = []
     for i in range(0, number):
-        randomTourList.append(Tour(randomTour[i]))
-        randomTourList[i].generate()
+        randomTourList.append(Tour(tourmanager, tourList[i][:-1]))
 
     # Initialize population
     pop = Population(tourmanager, populationSize=number, initialise=False)
@@ -323,20 +77,27 @@ if __name__ == '__main__':
     print("Initial distance: " + str(pop.getFittest().getDistance()))
 
     # Evolve population
-    ga = GA(tourmanager)
-
-    for i in range(n_generations):
+    # 세대마다 한 줄 요약 출력, --metrics (TSP_METRICS) 에 파일 경로를 주면 JSONL 로도 저장
+    metrics = Metrics(path=args.metrics, callback=printRecord)
+    ga = GA(tourmanager, mutationRate=args.mutation_rate, localSearch=args.local_search, metrics=metrics,
+            selection=args.selection, crossover=args.crossover, mutation=args.mutation)
+
+    # --checkpoint (TSP_CHECKPOINT) 에 파일 경로를 주면 checkpoint_interval 세대마다 저장하고,
+    # 파일이 이미 있으면 저장된 인구와 난수 상태로 그 세대부터 이어서 실행
+    checkpoint = args.checkpoint
+    checkpoint_interval = args.checkpoint_interval
+    start = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        pop, start = loadPopulation(checkpoint, tourmanager)
+        metrics.generation = start
+        print("Resume from generation %d: %s" % (start, str(pop.getFittest().getDistance())))
+
+    for i in range(start, n_generations):
         # population에 대해 유전알고리즘 시행 후 다시 저장
         pop = ga.evolvePopulation(pop)
-
-        # 가장 적합도가 높은 여행
-        fittest = pop.getFittest()
-
-        if i == n_generations - 1:
-            for j in range(1, n_cities):
-                plt.plot([fittest[j].x, fittest[j - 1].x], [fittest[j].y, fittest[j - 1].y], color="blue", linewidth=0.5)
-        print(pop.getFittest())
-        print("Final distance: " + str(pop.getFittest().getDistance()))
+        if checkpoint is not None and (i + 1) % checkpoint_interval == 0:
+            savePopulation(checkpoint, pop, i + 1)
+    metrics.close()
 
     # Print final results
     print("Finished")
@@ -346,11 +107,18 @@ if __name__ == '__main__':
     for i in range(0, n_cities):
         print(pop.getFittest().getCity(i).getIndex(), end=' -> ')
 
-    with open('ga_tree.csv', mode='w', newline='') as sam:
+    with open(args.output, mode='w', newline='') as sam:
         writer = csv.writer(sam)
         index_array = []
         for row in range(n_cities):
             index_array.append([pop.getFittest().getCity(row).getIndex()])
             writer.writerow(index_array[row])
 
-    plt.show()
+    # 도시는 scatter 하나, 여행은 LineCollection 하나로 그린다 (headless 면 PNG 로 저장)
+    showTour(coordinates, [pop.getFittest().getOrder()], path=args.plot, closed=False,
+             cityColor='lightblue', axis=[0, 100, 0, 100])
+
+
+# 파일 직접 실행시 실행
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+# 섬 모델 병렬 유전 알고리즘
+# 섬(인구)마다 따로 프로세스에서 GA_Random.GA 로 진화시키고
+# migrationInterval 세대마다 가장 좋은 여행 migrants 개를 도시 index 배열로 이웃 섬에 보낸다
+
+import queue
+import random
+import inspect
+import multiprocessing
+import numpy as np
+from City import City
+from City import TourManager
+from City import Tour
+from City import Population
+from GA_Random import GA
+from CityStore import loadCoordinates
+
+
+# 이주 epoch 에 island 가 보낼 섬, 받을 섬
+# ring 은 고정된 원, random 은 epoch 마다 모든 섬이 같은 seed 로 섞은 원
+def migrationPeers(island, islands, topology, topologyRandom):
+    ring = list(range(islands))
+    if topology == 'random':
+        topologyRandom.shuffle(ring)
+    place = ring.index(island)
+    return ring[(place + 1) % islands], ring[place - 1]
+
+
+# 섬 하나를 진화시키는 worker 프로세스
+def runIsland(island, islands, coordinates, populationSize, n_generations, migrationInterval, migrants,
+              topology, seed, topologySeed, inboxes, results, gaOptions):
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+    tourmanager = TourManager()
+    for i in range(len(coordinates)):
+        tourmanager.addCity(City(float(coordinates[i][0]), float(coordinates[i][1]), i))
+
+    # 시작 도시 0 고정 랜덤 여행
+    pop = Population(tourmanager, populationSize, False).randomize(np.random.default_rng(seed))
+
+    ga = GA(tourmanager, **gaOptions)
+    topologyRandom = random.Random(topologySeed)
+    pending = {}
+    epoch = 0
+    for generation in range(1, n_generations + 1):
+        pop = ga.evolvePopulation(pop)
+        if islands < 2 or generation % migrationInterval != 0 or generation == n_generations:
+            continue
+
+        epoch += 1
+        target, source = migrationPeers(island, islands, topology, topologyRandom)
+        ranks = pop.getRanks()
+        inboxes[target].put((epoch, np.stack([pop.getTour(int(r)).getOrder() for r in ranks[:migrants]])))
+
+        # 다른 epoch 메시지가 먼저 오면 보관해 둔다
+        while epoch not in pending:
+            received, orders = inboxes[island].get()
+            pending[received] = orders
+        incoming = pending.pop(epoch)
+
+        # 가장 나쁜 여행들을 이주해 온 여행으로 교체
+        for order, r in zip(incoming, ranks[::-1]):
+            pop.saveTour(int(r), Tour(tourmanager, order))
+
+    fittest = pop.getFittest()
+    results.put((island, fittest.getOrder(), fittest.getDistance()))
+
+
+class IslandModel:
+    def __init__(self, coordinates, islands=4, populationSize=50, migrationInterval=10, migrants=2,
+                 topology='ring', seed=None, **gaOptions):
+        if topology not in ('ring', 'random'):
+            raise ValueError('topology must be ring or random')
+        # 섬 프로세스 안에서 GA 를 만들다 죽지 않도록 옵션을 미리 확인
+        known = set(inspect.signature(GA.__init__).parameters) - {'self', 'tourmanager'}
+        unknown = sorted(set(gaOptions) - known)
+        if unknown:
+            raise ValueError('unknown GA options: ' + ', '.join(unknown))
+        for name, table in (('selection', GA.SELECTIONS), ('crossover', GA.CROSSOVERS), ('mutation', GA.MUTATIONS)):
+            if name in gaOptions and gaOptions[name] not in table:
+                raise ValueError('unknown %s: %s' % (name, gaOptions[name]))
+        self.coordinates = np.asarray(coordinates, dtype=np.float64)
+        self.islands = islands
+        self.populationSize = populationSize
+        self.migrationInterval = migrationInterval
+        self.migrants = migrants
+        self.topology = topology
+        self.seed = seed
+        self.gaOptions = gaOptions
+        # 결과를 기다리다 섬 프로세스가 죽었는지 확인하는 간격 (초)
+        self.pollInterval = 1.0
+
+    # 모든 섬을 n_generations 세대 진화, 섬별 (도시 index 순서, 거리) 리스트 리턴 (섬 번호 순)
+    def run(self, n_generations):
+        sequence = np.random.SeedSequence(self.seed)
+        seeds = [int(child.generate_state(1)[0]) for child in sequence.spawn(self.islands)]
+        topologySeed = int(sequence.generate_state(1)[0])
+
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        results = multiprocessing.Queue()
+        processes = []
+        for island in range(self.islands):
+            process = multiprocessing.Process(target=runIsland, args=(
+                island, self.islands, self.coordinates, self.populationSize, n_generations,
+                self.migrationInterval, self.migrants, self.topology, seeds[island], topologySeed,
+                inboxes, results, self.gaOptions))
+            process.start()
+            processes.append(process)
+
+        # 섬 프로세스가 결과 없이 죽으면 나머지 섬을 끝내고 에러 (기다리기만 하면 영원히 멈춘다)
+        best = [None] * self.islands
+        received = 0
+        while received < self.islands:
+            try:
+                island, order, distance = results.get(timeout=self.pollInterval)
+            except queue.Empty:
+                failed = [i for i, process in enumerate(processes) if process.exitcode not in (None, 0)]
+                if failed:
+                    for process in processes:
+                        if process.is_alive():
+                            process.terminate()
+                    for process in processes:
+                        process.join()
+                    raise RuntimeError('island %d exited with code %d' % (failed[0], processes[failed[0]].exitcode))
+                continue
+            best[island] = (order, distance)
+            received += 1
+        for process in processes:
+            process.join()
+        return best
+
+    # 모든 섬 중 가장 짧은 여행
+    def solve(self, n_generations):
+        return min(self.run(n_generations), key=lambda result: result[1])
+
+
+# 파일 직접 실행시 실행
+if __name__ == '__main__':
+    coordinates = loadCoordinates('../TSP.csv')
+
+    model = IslandModel(coordinates, islands=multiprocessing.cpu_count(), populationSize=30,
+                        migrationInterval=10, migrants=2, topology='ring', seed=1)
+    order, distance = model.solve(50)
+    print("Final distance: " + str(distance))
+    for i in range(len(order)):
+        print(order[i], end=' -> ')
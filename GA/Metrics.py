@@ -0,0 +1,91 @@
+# 세대별 기록
+# 선택, 교차, 변이, 지역 탐색, 평가에 걸린 시간, 길이 계산 횟수와 캐시 hit/miss,
+# 가장 좋은/평균/가장 나쁜 길이와 다양성을 세대마다 JSONL 파일 또는 callback 으로 내보낸다
+# GA 에 metrics 를 주지 않으면 (None) 아무것도 재지 않는다
+
+import json
+import time
+import numpy as np
+from City import EvaluationCounter
+
+
+# 가장 좋은 여행과 공유하지 않는 간선 비율의 평균 (0 이면 모두 같은 여행)
+def edgeDiversity(orders, best, numberOfCities):
+    following = np.roll(orders, -1, axis=1)
+    keys = np.minimum(orders, following).astype(np.int64) * numberOfCities + np.maximum(orders, following)
+    shared = np.isin(keys, keys[best]).sum(axis=1)
+    return float(1.0 - shared.mean() / orders.shape[1])
+
+
+# 한 줄 요약 출력 (main 에서 callback 으로 사용)
+def printRecord(record):
+    print('generation %d  best %.2f  mean %.2f  worst %.2f  diversity %s  %.3fs' % (
+        record['generation'], record['best'], record['mean'], record['worst'],
+        '-' if record['diversity'] is None else '%.3f' % record['diversity'], record['time']))
+
+
+class Metrics:
+    # path: JSONL 파일 (이어 쓰기), callback: 세대마다 기록 dict 를 받는 함수
+    # diversity: 다양성 계산 여부 (인구 수 x 도시 수 만큼 계산이 든다)
+    def __init__(self, path=None, callback=None, diversity=True):
+        self.file = open(path, 'a') if path is not None else None
+        self.callback = callback
+        self.diversity = diversity
+        self.generation = 0
+        self.phases = {}
+        self.started = 0.0
+        self.clock = 0.0
+        self.counters = (0, 0, 0)
+
+    def startGeneration(self):
+        self.phases = {}
+        self.started = self.clock = time.perf_counter()
+        self.counters = EvaluationCounter.snapshot()
+
+    # 마지막 mark 이후 걸린 시간을 phase 에 더한다
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.clock
+        self.clock = now
+
+    # 새 인구를 평가하고 세대 기록을 내보낸다
+    # cacheHits: 새 인구에서 길이가 이미 있던 (델타 갱신, 엘리트) 여행 수, cacheMisses: 전체 계산이 필요했던 여행 수
+    def endGeneration(self, pop):
+        misses = sum(1 for tour in pop.tours if tour.distance == 0)
+        lengths = pop.evaluate()
+        self.mark('evaluation')
+        evaluations, deltas = EvaluationCounter.snapshot()
+
+        diversity = None
+        if self.diversity:
+            diversity = edgeDiversity(pop.getOrderMatrix(), pop.getFittestIndex(),
+                                      pop.tourmanager.numberOfCities())
+
+        record = {
+            'generation': self.generation,
+            'time': time.perf_counter() - self.started,
+            'phases': self.phases,
+            'evaluations': evaluations - self.counters[0],
+            'cacheHits': pop.populationSize() - misses,
+            'cacheMisses': misses,
+            'deltaUpdates': deltas - self.counters[1],
+            'best': float(lengths.min()),
+            'mean': float(lengths.mean()),
+            'worst': float(lengths.max()),
+            'diversity': diversity,
+        }
+        self.emit(record)
+        self.generation += 1
+        return record
+
+    def emit(self, record):
+        if self.file is not None:
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+        if self.callback is not None:
+            self.callback(record)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,27 @@
+import numpy as np
+from Spatial import GridIndex
+
+# 이보다 도시가 많으면 격자 색인으로 찾는다
+GRID_LIMIT = 4000
+
+
+# 도시마다 가까운 k 개 도시 index (가까운 순), (n x k) int32 배열
+# 거리 행렬 전체를 만들지 않도록 block 행씩 계산
+def nearestNeighbors(coordinates, k, block=1024):
+    xy = np.asarray(coordinates, dtype=np.float64)
+    n = len(xy)
+    if n > GRID_LIMIT:
+        return GridIndex(xy, perCell=max(k, 2)).neighbors(k)
+    k = max(min(k, n - 1), 0)
+    neighbors = np.empty((n, k), dtype=np.int32)
+    if k == 0:
+        return neighbors
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        rows = np.arange(start, end)
+        distance = np.hypot(xy[start:end, 0, None] - xy[:, 0], xy[start:end, 1, None] - xy[:, 1])
+        distance[rows - start, rows] = np.inf
+        nearest = np.argpartition(distance, k - 1, axis=1)[:, :k]
+        nearestDistance = np.take_along_axis(distance, nearest, axis=1)
+        neighbors[start:end] = np.take_along_axis(nearest, np.argsort(nearestDistance, axis=1), axis=1)
+    return neighbors
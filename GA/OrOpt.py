@@ -0,0 +1,142 @@
+import math
+from collections import deque
+import numpy as np
+from Neighbor import nearestNeighbors
+
+# 이 값보다 작은 개선은 무시
+EPSILON = 1e-9
+
+
+# Or-opt 지역 탐색
+# 도시 1 ~ maxSegment 개 구간을 떼어 (뒤집어서라도) 가까운 도시 옆 간선에 끼워 넣는다
+# closed=False 면 처음과 끝 도시가 고정된 열린 경로 (dfs 군집의 cities_order)
+class OrOpt:
+    def __init__(self, coordinates, neighbors=8, neighborList=None, maxSegment=3):
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        self.x = coordinates[:, 0].tolist()
+        self.y = coordinates[:, 1].tolist()
+        if neighborList is None:
+            neighborList = nearestNeighbors(coordinates, neighbors)
+        self.neighbors = np.asarray(neighborList).tolist()
+        self.maxSegment = maxSegment
+
+    def distance(self, a, b):
+        return math.hypot(self.x[a] - self.x[b], self.y[a] - self.y[b])
+
+    # 도시 index 순서(order)를 개선해서 (새 순서, 줄어든 길이) 리턴, 첫 도시는 그대로
+    # active 를 주면 그 도시들만 처음에 탐색한다
+    def optimize(self, order, closed=True, active=None):
+        order = np.asarray(order).tolist()
+        size = len(order)
+        # 열린 경로는 끝 도시도 고정
+        last = size - 1 if closed else size - 2
+        if last < 2:
+            return np.array(order, dtype=np.int32), 0.0
+
+        position = [-1] * len(self.x)
+        for i in range(size):
+            position[order[i]] = i
+        queue = deque(order if active is None else active)
+        inQueue = [False] * len(self.x)
+        for city in queue:
+            inQueue[city] = True
+
+        distance = self.distance
+        totalGain = 0.0
+        while queue:
+            a = queue.popleft()
+            inQueue[a] = False
+            if position[a] < 0:
+                continue
+            move = self.findMove(order, position, a, closed, last)
+            if move is None:
+                continue
+            gain, start, end, after, reverse = move
+            touched = [order[start - 1], order[end], order[start], order[(end + 1) % size],
+                       order[after], order[(after + 1) % size]]
+            self.moveSegment(order, position, start, end, after, reverse)
+            totalGain += gain
+            for city in touched:
+                if not inQueue[city]:
+                    inQueue[city] = True
+                    queue.append(city)
+        return np.array(order, dtype=np.int32), totalGain
+
+    # a 에서 시작하거나 끝나는 구간의 첫 개선 이동 (이득, 시작, 끝, 끼울 위치, 뒤집기)
+    def findMove(self, order, position, a, closed, last):
+        size = len(order)
+        distance = self.distance
+        posA = position[a]
+        for length in range(1, self.maxSegment + 1):
+            for start in (posA, posA - length + 1):
+                end = start + length - 1
+                if start < 1 or end > last:
+                    continue
+                first = order[start]
+                final = order[end]
+                pred = order[start - 1]
+                succ = order[(end + 1) % size]
+                removeGain = distance(pred, first) + distance(final, succ) - distance(pred, succ)
+                if removeGain <= EPSILON:
+                    continue
+                for city in (first, final):
+                    for c in self.neighbors[city]:
+                        if distance(city, c) >= removeGain:
+                            break
+                        posC = position[c]
+                        if posC < 0 or start <= posC <= end:
+                            continue
+                        # c 다음 간선, c 이전 간선에 끼우기
+                        for after in (posC, posC - 1):
+                            if after < 0:
+                                if not closed:
+                                    continue
+                                after += size
+                            if not closed and after >= size - 1:
+                                continue
+                            if start - 1 <= after <= end:
+                                continue
+                            g = order[after]
+                            h = order[(after + 1) % size]
+                            gh = distance(g, h)
+                            forward = distance(g, first) + distance(final, h) - gh
+                            backward = distance(g, final) + distance(first, h) - gh
+                            if forward <= backward and removeGain - forward > EPSILON:
+                                return removeGain - forward, start, end, after, False
+                            if backward < forward and removeGain - backward > EPSILON:
+                                return removeGain - backward, start, end, after, True
+                if length == 1:
+                    break
+        return None
+
+    # start ~ end 구간을 after 위치 도시 뒤로 옮기기 (사이 구간만 밀고 위치 갱신)
+    def moveSegment(self, order, position, start, end, after, reverse):
+        segment = order[start:end+1]
+        if reverse:
+            segment.reverse()
+        if after > end:
+            lo = start
+            order[start:after+1] = order[end+1:after+1] + segment
+            hi = after
+        else:
+            lo = after + 1
+            order[after+1:end+1] = segment + order[after+1:start]
+            hi = end
+        for i in range(lo, hi + 1):
+            position[order[i]] = i
+
+    # City.Tour 를 제자리에서 개선 (거리는 다음 evaluate 때 다시 계산)
+    def improveTour(self, tour):
+        order, gain = self.optimize(tour.getOrder())
+        if gain > 0:
+            tour.setOrder(order)
+        return tour
+
+
+# City 리스트(여행 또는 열린 경로)를 Or-opt 로 개선한 새 리스트
+def improveCities(cities, closed=True, neighbors=8):
+    if len(cities) < 4:
+        return list(cities)
+    coordinates = [[float(city.x), float(city.y)] for city in cities]
+    order, gain = OrOpt(coordinates, neighbors).optimize(range(len(cities)), closed)
+    return [cities[i] for i in order]
@@ -0,0 +1,166 @@
+# 군집으로 나눠 풀고 이어 붙이는 계층형 TSP 파이프라인
+# 1. KClustering 으로 군집 나누기  2. 군집마다 여행을 프로세스 풀에서 풀기
+# 3. 군집 순서와 들어가고 나오는 도시 정하기  4. 군집 경계 주변만 2-opt, Or-opt 로 다듬기
+
+import csv
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from Spatial import GridIndex
+from Neighbor import nearestNeighbors
+from TwoOpt import TwoOpt
+from OrOpt import OrOpt
+from ClusterOrder import ClusterOrder
+import ga2
+from CityStore import loadCoordinates
+
+
+# 좌표 배열에서 순서대로 도는 닫힌 여행 길이
+def tourLength(xy, order):
+    diff = xy[order] - xy[np.roll(order, -1)]
+    return float(np.hypot(diff[:, 0], diff[:, 1]).sum())
+
+
+# 군집 하나를 최근접 이웃 + 2-opt + Or-opt 로 풀기, 리턴은 (군집 안 도시 index 순서, 거리)
+def solveLocal(coordinates):
+    xy = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    n = len(xy)
+    if n < 4:
+        return list(range(n)), tourLength(xy, np.arange(n))
+
+    index = GridIndex(xy)
+    index.remove(0)
+    order = [0]
+    for i in range(n - 1):
+        current = order[-1]
+        order += index.popNearestK(xy[current, 0], xy[current, 1], 1)
+
+    neighbors = nearestNeighbors(xy, 8)
+    order, gain = TwoOpt(xy, neighborList=neighbors).optimize(order)
+    order, gain = OrOpt(xy, neighborList=neighbors).optimize(order)
+    return order.tolist(), tourLength(xy, order)
+
+
+# 군집 하나를 ga2 유전 알고리즘으로 풀기 (인구 수는 군집 도시 수)
+def solveGA(coordinates, n_generations=50, seed=None):
+    return ga2.solveCluster(coordinates, len(coordinates), n_generations, seed, localSearch='elite')
+
+
+class Pipeline:
+    # clusterSize: 군집 하나의 평균 도시 수, solver: 'local' 또는 'ga'
+    def __init__(self, coordinates, clusterSize=100, solver='local', workers=None, n_generations=50, seed=None):
+        if solver not in ('local', 'ga'):
+            raise ValueError('solver must be local or ga')
+        self.xy = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        self.clusterSize = clusterSize
+        self.solver = solver
+        self.workers = workers
+        self.n_generations = n_generations
+        self.seed = seed
+
+    # 전체 단계 실행, 도시 0 에서 시작하는 도시 index 순서와 거리 리턴
+    def run(self):
+        members = self.clusterCities()
+        tours = self.solveClusters(members)
+        sequence = self.orderClusters(members)
+        order, boundary = self.stitch(tours, sequence)
+        order = self.repair(order, boundary)
+        return order, tourLength(self.xy, order)
+
+    # 1. 군집 나누기, 도시 0 이 든 군집이 0 번, 군집별 도시 index 배열 리스트
+    def clusterCities(self):
+        n = len(self.xy)
+        k = max(1, min(n, int(round(n / self.clusterSize))))
+        if k == 1:
+            return [np.arange(n)]
+        labels = np.asarray(ga2.KClustering().labels(k, self.xy))
+        first = labels[0]
+        labels = np.where(labels == first, -1, labels)
+        labels = np.where(labels == 0, first, labels)
+        labels[labels == -1] = 0
+        members = [np.flatnonzero(labels == c) for c in range(k)]
+        return [m for m in members if len(m) > 0]
+
+    # 2. 군집마다 닫힌 여행 풀기 (프로세스 풀), 전체 도시 index 순서 리스트
+    def solveClusters(self, members):
+        coordinates = [self.xy[m].tolist() for m in members]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            if self.solver == 'local':
+                results = list(executor.map(solveLocal, coordinates, chunksize=8))
+            else:
+                seeds = [None if self.seed is None else self.seed + i for i in range(len(members))]
+                results = list(executor.map(solveGA, coordinates, [self.n_generations] * len(members), seeds))
+        return [members[c][np.asarray(results[c][0], dtype=np.int64)] for c in range(len(members))]
+
+    # 3. 군집 중심으로 군집 순서 정하기 (군집 0 이 맨 앞)
+    def orderClusters(self, members):
+        centroids = np.array([self.xy[m].mean(axis=0) for m in members])
+        sequence, length = ClusterOrder(centroids, centroids).solve()
+        return [c for c, reverse in sequence]
+
+    # 군집 여행을 끊을 간선과 방향 고르기
+    # 간선 i (cyc[i] - cyc[i+1]) 를 끊으면 정방향은 cyc[i+1] 로 들어가 cyc[i] 로 나오고, 역방향은 반대
+    # 비용 = 이전 도시 -> 들어가는 도시 + 나오는 도시 -> 다음 목표 - 끊은 간선
+    def cutCycle(self, cycle, previous, target, fixedStart=None):
+        size = len(cycle)
+        if size == 1:
+            return cycle
+        xy = self.xy
+        following = np.roll(cycle, -1)
+        edge = np.hypot(*(xy[cycle] - xy[following]).T)
+        if fixedStart is not None:
+            # 시작 도시 바로 앞(정방향) 또는 바로 뒤(역방향) 간선만 끊을 수 있다
+            place = int(np.flatnonzero(cycle == fixedStart)[0])
+            forward = math.hypot(*(xy[cycle[place - 1]] - target)) - edge[place - 1]
+            backward = math.hypot(*(xy[cycle[(place + 1) % size]] - target)) - edge[place]
+            if forward <= backward:
+                return np.roll(cycle, -place)
+            return np.roll(cycle[::-1], -(size - 1 - place))
+        forward = np.hypot(*(xy[following] - previous).T) + np.hypot(*(xy[cycle] - target).T) - edge
+        backward = np.hypot(*(xy[cycle] - previous).T) + np.hypot(*(xy[following] - target).T) - edge
+        i = int(np.argmin(np.minimum(forward, backward)))
+        if forward[i] <= backward[i]:
+            return np.roll(cycle, -(i + 1))
+        return np.roll(cycle[::-1], -(size - 1 - i))
+
+    # 군집 경로를 이어 붙여 하나의 여행으로, 군집 경계 도시도 같이 리턴
+    def stitch(self, tours, sequence):
+        xy = self.xy
+        paths = []
+        boundary = []
+        previous = xy[0]
+        for place in range(len(sequence)):
+            if place + 1 < len(sequence):
+                target = xy[tours[sequence[place + 1]]].mean(axis=0)
+            else:
+                target = xy[0]
+            cycle = tours[sequence[place]]
+            path = self.cutCycle(cycle, previous, target, fixedStart=0 if place == 0 else None)
+            paths.append(path)
+            boundary.extend([int(path[0]), int(path[-1])])
+            previous = xy[path[-1]]
+        return np.concatenate(paths).astype(np.int32), boundary
+
+    # 4. 경계 도시부터 시작해 2-opt, Or-opt 로 이음매 다듬기
+    def repair(self, order, boundary):
+        neighbors = nearestNeighbors(self.xy, 8)
+        active = set(boundary)
+        for city in boundary:
+            active.update(neighbors[city].tolist())
+        active = sorted(active)
+        order, gain = TwoOpt(self.xy, neighborList=neighbors).optimize(order, active=active)
+        order, gain = OrOpt(self.xy, neighborList=neighbors).optimize(order, active=active)
+        return order
+
+
+# 파일 직접 실행시 실행
+if __name__ == '__main__':
+    coordinates = loadCoordinates('../TSP.csv')
+
+    order, distance = Pipeline(coordinates, clusterSize=100).run()
+    print("Final distance: " + str(distance))
+
+    with open('solution_pipeline.csv', mode='w', newline='') as sam:
+        writer = csv.writer(sam)
+        for city in order:
+            writer.writerow([city])
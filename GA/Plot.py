@@ -0,0 +1,99 @@
+# 그림 그리기
+# 여행 하나를 선분마다 plt.plot 하지 않고 LineCollection 하나, 도시는 scatter 하나로 그린다
+# TSP_HEADLESS=1 이면 창을 띄우지 않고 Agg 백엔드로 PNG 만 저장 (배치 작업, 워커 프로세스)
+# TSP_PLOT=0 이면 그림을 아예 그리지 않는다
+# matplotlib 은 실제로 그릴 때 처음 한 번만 불러온다
+
+import os
+import numpy as np
+
+HEADLESS = os.environ.get('TSP_HEADLESS', '0').lower() not in ('', '0', 'false', 'no')
+ENABLED = os.environ.get('TSP_PLOT', '1').lower() not in ('', '0', 'false', 'no')
+
+
+# matplotlib.pyplot 을 불러와서 리턴, headless 면 화면 없는 Agg 백엔드 사용
+def pyplot():
+    import matplotlib
+    if HEADLESS:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+# pyplot 상태를 쓰지 않는 화면 밖 Figure (Agg)
+def offscreenFigure(size=(8, 8), dpi=100):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    figure = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+# 순서 리스트들의 선분 (m x 2 x 2), closed 면 마지막 도시에서 처음 도시로 돌아오는 선분 포함
+def tourSegments(coordinates, orders, closed=True):
+    xy = np.asarray(coordinates, dtype=np.float64)
+    segments = []
+    for order in orders:
+        order = np.asarray(order, dtype=np.int64)
+        if len(order) < 2:
+            continue
+        if closed:
+            order = np.append(order, order[0])
+        points = xy[order]
+        segments.append(np.stack((points[:-1], points[1:]), axis=1))
+    if not segments:
+        return np.empty((0, 2, 2))
+    return np.concatenate(segments)
+
+
+# 도시 전체를 scatter 하나로, colors 에 도시마다 값(군집 번호 등)을 주면 색으로 구분
+def drawCities(ax, coordinates, color='grey', colors=None, size=4):
+    xy = np.asarray(coordinates, dtype=np.float64)
+    if colors is not None:
+        return ax.scatter(xy[:, 0], xy[:, 1], c=colors, cmap='tab20', s=size)
+    return ax.scatter(xy[:, 0], xy[:, 1], c=color, s=size)
+
+
+# 여행(들)을 LineCollection 하나로, orders 는 도시 index 순서의 리스트
+def drawTour(ax, coordinates, orders, closed=True, color='blue', linewidth=0.5):
+    from matplotlib.collections import LineCollection
+    lines = LineCollection(tourSegments(coordinates, orders, closed), colors=color, linewidths=linewidth)
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return lines
+
+
+def drawFigure(ax, coordinates, orders, closed, cityColor, cityColors, tourColor, axis, title):
+    drawCities(ax, coordinates, cityColor, cityColors)
+    if orders:
+        drawTour(ax, coordinates, orders, closed, tourColor)
+    if axis is not None:
+        ax.axis(axis)
+    if title is not None:
+        ax.set_title(title)
+
+
+# 화면 밖에서 그려서 PNG 로 저장
+def saveTour(path, coordinates, orders=(), closed=True, cityColor='grey', cityColors=None,
+             tourColor='blue', axis=None, title=None, dpi=100):
+    if not ENABLED:
+        return
+    figure = offscreenFigure(dpi=dpi)
+    drawFigure(figure.add_subplot(1, 1, 1), coordinates, orders, closed,
+               cityColor, cityColors, tourColor, axis, title)
+    figure.savefig(path)
+
+
+# 결과 보여주기, headless 면 창 대신 path 에 PNG 저장 (path 가 없으면 아무것도 안 함)
+def showTour(coordinates, orders=(), path=None, closed=True, cityColor='grey', cityColors=None,
+             tourColor='blue', axis=None, title=None):
+    if not ENABLED:
+        return
+    if HEADLESS:
+        if path is not None:
+            saveTour(path, coordinates, orders, closed, cityColor, cityColors, tourColor, axis, title)
+        return
+    plt = pyplot()
+    figure, ax = plt.subplots()
+    drawFigure(ax, coordinates, orders, closed, cityColor, cityColors, tourColor, axis, title)
+    plt.show()
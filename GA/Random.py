@@ -2,6 +2,8 @@ import numpy as np
 import csv
 import random
 from City import City
+from City import randomOrders
+from City import orderLengths
 
 class tour:
     def __init__(self, cities_array):
@@ -13,27 +15,31 @@ class tour:
         return self.cities_order
 
     # cities 배열 생성
+    # 시작 도시 뒤에 나머지 도시를 한 번에 섞어 넣고, 마지막에 시작 도시로 돌아온다
     def makeOrder(self, cities):
-        copy_cities = cities.copy();
-        # valid_index = len(cities)
-        next_index = 0
-        start_city = copy_cities[0]
-        self.cities_order.append(copy_cities[next_index])  # 시작 도시를 먼저 삽입후 시작
-        del copy_cities[next_index]
+        orders = randomOrders(1, len(cities))
+        self.setOrder(cities, orders[0], float(orderLengths(coordinatesOf(cities), orders)[0]))
 
-        for i in range(len(copy_cities)):
-            next_index = random.randint(0, len(copy_cities) - 1)  # copy_cities에서 랜덤 인덱스값 받아오기
-            # print(next_index)
-            self.cities_order.append(copy_cities[next_index])
-            del copy_cities[next_index]
+    # 도시 위치 순서와 (시작 도시로 돌아오는 간선까지 포함한) 길이로 설정
+    def setOrder(self, cities, order, length):
+        self.cities_order = [cities[i] for i in order.tolist()]
+        self.cities_order.append(self.cities_order[0])
+        self.total_length = length
 
-            pre_city = self.cities_order[i]
-            post_city = self.cities_order[i + 1]
-            self.total_length = self.total_length + pre_city.getDistance(post_city)
 
-        # 1000개의 배열이 끝난뒤 TSP이기 때문에 마지막으로 시작도시를 넣어준다.
-        self.cities_order.append(start_city)
-        self.total_length = self.total_length + pre_city.getDistance(start_city)
+# 도시 리스트 좌표 (n x 2)
+def coordinatesOf(cities):
+    return np.array([[float(city.x), float(city.y)] for city in cities], dtype=np.float64).reshape(-1, 2)
 
 
+# 랜덤 여행 number 개를 (number x 도시 수) 배열 하나로 섞어 만들고 길이도 한 번에 계산
+def makeOrders(cities, number):
+    orders = randomOrders(number, len(cities))
+    lengths = orderLengths(coordinatesOf(cities), orders)
 
+    tours = []
+    for i in range(number):
+        tournode = tour(cities)
+        tournode.setOrder(cities, orders[i], float(lengths[i]))
+        tours.append(tournode)
+    return tours
@@ -1,31 +1,32 @@
 # 1. Random으로 TSP문제 풀기
 
 import csv
-from City import City
-from Random import tour
-import matplotlib.pyplot as plt
+from CityStore import loadCities
+from CityStore import loadCoordinates
+from Random import makeOrders
+from Plot import showTour
+from Cli import baseParser
+from Cli import parseArgs
+from Cli import seedAll
+from Cli import askInt
 
 cities = []
 new_cities = []
 sol = []
 parentGene = []
 
-i = 0
-# csv값들을 받아 도시 클래스 배열에 대입
-with open('../TSP.csv', mode='r', newline='') as tsp:
-    reader = csv.reader(tsp)
-    i = 0
-    for row in reader:
-        cities.append(City(float(row[0]), float(row[1]), i))
-        i = i + 1
-        plt.scatter(float(row[0]), float(row[1]), c='grey')
-        plt.axis([0, 100, 0, 100])
-
-number = int(input("생성할 부모 gene 수를 입력하시오 :  "))
-for i in range(number):
-    tournode = tour(cities)
-    tournode.makeOrder(cities)
-    parentGene.append(tournode)
+# 명령행 (또는 --config) 옵션, 부모 gene 수를 주지 않으면 input() 으로 묻는다
+parser = baseParser('Random tours', 'solution_random.csv', plot='random.png')
+parser.add_argument('--population', type=int, default=None, help='number of random tours')
+args = parseArgs(parser)
+seedAll(args.seed)
+
+# CityStore 캐시에서 좌표를 읽어 도시 클래스 배열에 대입
+cities = loadCities(args.cities, args.n_cities)
+
+number = askInt(args.population, "생성할 부모 gene 수를 입력하시오 :  ")
+# 랜덤 여행 number 개를 한 번에 섞어 만들고 길이도 한 번에 계산
+parentGene = makeOrders(cities, number)
 
 for i in range(number):
     k = parentGene[i].total_length
@@ -33,7 +34,7 @@ for i in range(number):
     print(len(parentGene[0].cities_order))
     print(last)
 
-with open('solution_random.csv', mode='w', newline='') as sam:
+with open(args.output, mode='w', newline='') as sam:
     writer = csv.writer(sam)
     index_array = []
     for row in range(len(parentGene[0].cities_order)):
@@ -42,7 +43,6 @@ with open('solution_random.csv', mode='w', newline='') as sam:
         writer.writerow(index_array[row])
 
 print(parentGene[0].total_length)
-for j in range(1, len(parentGene[0].cities_order)):
-    plt.plot([parentGene[0].cities_order[j].x, parentGene[0].cities_order[j - 1].x], [parentGene[0].cities_order[j].y, parentGene[0].cities_order[j - 1].y], color="blue", linewidth=0.5)
-
-plt.show()
\ No newline at end of file
+# 도시는 scatter 하나, 여행은 LineCollection 하나로 그린다 (headless 면 PNG 로 저장)
+showTour(loadCoordinates(args.cities, args.n_cities), [[city.index for city in parentGene[0].cities_order]],
+         path=args.plot, closed=False, axis=[0, 100, 0, 100])
@@ -0,0 +1,215 @@
+# 시작 여행 만들기
+# hilbert: 힐베르트 곡선 위 위치 순서로 정렬, O(n log n)
+# nearest: 격자 색인으로 남은 도시 중 가장 가까운 도시를 따라간다
+# greedy: 가까운 이웃 후보 간선을 짧은 순으로 골라 (차수 2 이하, 사이클 없이) 조각을 만들고 조각 끝을 가까운 순으로 잇는다
+# random 이 붙은 두 번째 여행부터는 방법마다 무작위 변형을 써서 인구가 다양해지게 한다
+#   hilbert: 좌표를 무작위로 돌려서 곡선을 바꾼다, nearest: 시작 도시와 가끔 두세 번째로 가까운 도시를 고른다,
+#   greedy: 간선 길이에 작은 잡음을 곱해 고르는 순서를 바꾼다
+# 모든 여행은 도시 0 이 맨 앞에 오도록 회전
+
+import numpy as np
+from City import randomOrders
+from Spatial import GridIndex
+from Neighbor import nearestNeighbors
+
+METHODS = ['random', 'hilbert', 'nearest', 'greedy']
+
+# 힐베르트 곡선 한 변의 칸 수 (2 ** HILBERT_BITS)
+HILBERT_BITS = 16
+
+
+# 'hilbert=5,nearest=4,greedy=1' -> {'hilbert': 5, 'nearest': 4, 'greedy': 1}
+def parseMix(text):
+    mix = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        name, count = part.split('=')
+        name = name.strip()
+        if name not in METHODS:
+            raise ValueError('unknown seeding method: ' + name)
+        mix[name] = mix.get(name, 0) + int(count)
+    return mix
+
+
+# 도시 0 이 맨 앞에 오도록 회전한 int32 순서
+def startAtZero(order):
+    order = np.asarray(order, dtype=np.int32)
+    return np.roll(order, -int(np.flatnonzero(order == 0)[0]))
+
+
+# 좌표마다 힐베르트 곡선 위치 (int64)
+def hilbertIndex(coordinates, bits=HILBERT_BITS):
+    xy = np.asarray(coordinates, dtype=np.float64)
+    side = 1 << bits
+    low = xy.min(axis=0)
+    span = max(float(np.ptp(xy, axis=0).max()), 1e-12)
+    cells = np.minimum(((xy - low) / span * (side - 1)).astype(np.int64), side - 1)
+    x = cells[:, 0].copy()
+    y = cells[:, 1].copy()
+
+    d = np.zeros(len(xy), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+        # 사분면에 맞게 회전
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return d
+
+
+# 힐베르트 곡선 순서, rng 를 주면 좌표를 무작위 각도로 돌린 곡선
+def hilbertOrder(coordinates, rng=None):
+    xy = np.asarray(coordinates, dtype=np.float64)
+    if rng is not None:
+        angle = rng.uniform(0, 2 * np.pi)
+        rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        xy = (xy - xy.mean(axis=0)) @ rotation.T
+    return startAtZero(np.argsort(hilbertIndex(xy), kind='stable'))
+
+
+# 가장 가까운 남은 도시 따라가기
+# rng 를 주면 무작위 도시에서 시작하고, 확률 noise 로 가까운 3 개 중 하나를 고른다
+def nearestNeighborOrder(coordinates, rng=None, noise=0.1):
+    xy = np.asarray(coordinates, dtype=np.float64)
+    n = len(xy)
+    x = xy[:, 0].tolist()
+    y = xy[:, 1].tolist()
+    index = GridIndex(xy)
+    current = 0 if rng is None else int(rng.integers(n))
+    index.remove(current)
+    order = [current]
+    for i in range(n - 1):
+        if rng is not None and rng.random() < noise:
+            found = index.nearestK(x[current], y[current], 3)
+            current = found[int(rng.integers(len(found)))]
+            index.remove(current)
+        else:
+            current = index.popNearestK(x[current], y[current], 1)[0]
+        order.append(current)
+    return startAtZero(order)
+
+
+def findRoot(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+# 짧은 간선부터 차수 2 이하, 사이클 없이 고른 조각들을 가까운 끝끼리 이어 붙인다
+# rng 를 주면 간선 길이에 (1 ~ 1 + noise) 잡음을 곱해 고르는 순서를 바꾼다
+def greedyOrder(coordinates, neighbors=None, rng=None, noise=0.1):
+    xy = np.asarray(coordinates, dtype=np.float64)
+    n = len(xy)
+    if n < 3:
+        return startAtZero(np.arange(n))
+    if neighbors is None:
+        neighbors = nearestNeighbors(xy, 8)
+
+    # 후보 간선 (i < j) 을 길이 순으로
+    first = np.repeat(np.arange(n), neighbors.shape[1])
+    second = np.asarray(neighbors, dtype=np.int64).ravel()
+    low = np.minimum(first, second)
+    high = np.maximum(first, second)
+    keys = np.unique(low * n + high)
+    low, high = keys // n, keys % n
+    lengths = np.hypot(*(xy[low] - xy[high]).T)
+    if rng is not None:
+        lengths = lengths * rng.uniform(1.0, 1.0 + noise, len(lengths))
+    ranked = np.argsort(lengths, kind='stable')
+
+    degree = [0] * n
+    parent = list(range(n))
+    adjacent = [[] for i in range(n)]
+    for i, j in zip(low[ranked].tolist(), high[ranked].tolist()):
+        if degree[i] >= 2 or degree[j] >= 2:
+            continue
+        rootI, rootJ = findRoot(parent, i), findRoot(parent, j)
+        if rootI == rootJ:
+            continue
+        parent[rootI] = rootJ
+        degree[i] += 1
+        degree[j] += 1
+        adjacent[i].append(j)
+        adjacent[j].append(i)
+
+    # 차수 2 미만인 도시에서 출발해 조각(경로) 모으기
+    fragments = []
+    visited = [False] * n
+    for start in range(n):
+        if visited[start] or degree[start] == 2:
+            continue
+        path = [start]
+        visited[start] = True
+        previous, current = -1, start
+        while True:
+            following = [c for c in adjacent[current] if c != previous]
+            if not following:
+                break
+            previous, current = current, following[0]
+            path.append(current)
+            visited[current] = True
+        fragments.append(path)
+
+    # 조각 끝들을 격자 색인에 넣고, 현재 끝에서 가장 가까운 다른 조각 끝으로 잇는다
+    ends = []
+    for f in range(len(fragments)):
+        ends.append((f, 0))
+        if len(fragments[f]) > 1:
+            ends.append((f, 1))
+    endIndex = GridIndex(xy[[fragments[f][0] if side == 0 else fragments[f][-1] for f, side in ends]])
+    endSlots = [[] for f in range(len(fragments))]
+    for e, (f, side) in enumerate(ends):
+        endSlots[f].append(e)
+
+    x = xy[:, 0].tolist()
+    y = xy[:, 1].tolist()
+    start = 0 if rng is None else int(rng.integers(len(fragments)))
+    for e in endSlots[start]:
+        endIndex.remove(e)
+    order = list(fragments[start])
+    for i in range(len(fragments) - 1):
+        last = order[-1]
+        e = endIndex.nearest(x[last], y[last])
+        f, side = ends[e]
+        for slot in endSlots[f]:
+            endIndex.remove(slot)
+        order.extend(fragments[f] if side == 0 else fragments[f][::-1])
+    return startAtZero(order)
+
+
+# mix (방법 -> 개수) 대로 시작 여행 count 개 (count x n), 모자라는 자리는 random
+# 방법마다 첫 여행은 정해진 여행, 두 번째부터는 rng 로 만든 무작위 변형
+def seedOrders(coordinates, mix, count, rng=None, neighbors=None):
+    xy = np.asarray(coordinates, dtype=np.float64)
+    n = len(xy)
+    if rng is None:
+        rng = np.random.default_rng(np.random.randint(0, 2 ** 31 - 1))
+    for name in mix:
+        if name not in METHODS:
+            raise ValueError('unknown seeding method: ' + str(name))
+    if sum(mix.values()) > count:
+        raise ValueError('seeding mix has %d tours for %d slots' % (sum(mix.values()), count))
+
+    orders = randomOrders(count, n, rng)
+    row = 0
+    for name in METHODS:
+        for k in range(mix.get(name, 0)):
+            variant = rng if k > 0 else None
+            if name == 'hilbert':
+                orders[row] = hilbertOrder(xy, variant)
+            elif name == 'nearest':
+                orders[row] = nearestNeighborOrder(xy, variant)
+            elif name == 'greedy':
+                if neighbors is None:
+                    neighbors = nearestNeighbors(xy, 8)
+                orders[row] = greedyOrder(xy, neighbors, variant)
+            row += 1
+    return orders
@@ -0,0 +1,18 @@
+import numpy as np
+
+
+# 룰렛 휠 선택
+# 세대마다 누적 적합도 표를 한 번 만들고 이진 탐색으로 여행 index 를 뽑는다
+class RouletteWheel:
+    def __init__(self, fitness):
+        self.cumulative = np.cumsum(fitness, dtype=np.float64)
+        self.total = self.cumulative[-1]
+
+    def __len__(self):
+        return len(self.cumulative)
+
+    # size 개의 여행 index 를 한 번에 뽑기 (size 가 None 이면 하나)
+    def draw(self, size=None):
+        rand = np.random.random(size) * self.total
+        index = np.searchsorted(self.cumulative, rand, side='left')
+        return np.minimum(index, len(self.cumulative) - 1)
@@ -0,0 +1,153 @@
+import math
+import numpy as np
+
+
+# 균일 격자 공간 색인
+# 칸마다 평균 perCell 개 도시가 들어가게 나누고, 가까운 칸부터 고리 모양으로 넓혀 가며 찾는다
+# remove 로 방문한 도시를 지우면 남은 도시 중에서만 찾는다
+class GridIndex:
+    def __init__(self, coordinates, perCell=2):
+        xy = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        n = len(xy)
+        self.x = xy[:, 0].tolist()
+        self.y = xy[:, 1].tolist()
+        self.count = n
+        if n == 0:
+            self.minX = self.minY = 0.0
+            self.cellSize = 1.0
+            self.columns = self.rows = 1
+            self.cells = [[]]
+            self.cellOf = []
+            self.slot = []
+            return
+
+        self.minX, self.minY = xy.min(axis=0).tolist()
+        spanX, spanY = np.ptp(xy, axis=0).tolist()
+        side = max(1, int(math.sqrt(n / perCell)))
+        self.cellSize = max(spanX, spanY) / side or 1.0
+        self.columns = int(spanX / self.cellSize) + 1
+        self.rows = int(spanY / self.cellSize) + 1
+
+        column = np.minimum(((xy[:, 0] - self.minX) / self.cellSize).astype(np.int64), self.columns - 1)
+        row = np.minimum(((xy[:, 1] - self.minY) / self.cellSize).astype(np.int64), self.rows - 1)
+        self.cellOf = (row * self.columns + column).tolist()
+        self.cells = [[] for _ in range(self.columns * self.rows)]
+        self.slot = [0] * n
+        for i in range(n):
+            cell = self.cells[self.cellOf[i]]
+            self.slot[i] = len(cell)
+            cell.append(i)
+
+    def __len__(self):
+        return self.count
+
+    # 지운 상태까지 그대로 복사 (같은 좌표로 여러 번 쓸 때 다시 만들지 않도록)
+    def copy(self):
+        index = GridIndex.__new__(GridIndex)
+        index.__dict__.update(self.__dict__)
+        index.cells = [cell[:] for cell in self.cells]
+        index.slot = self.slot[:]
+        return index
+
+    # 도시 지우기, 같은 칸의 마지막 도시를 빈 자리로 옮겨 O(1)
+    def remove(self, i):
+        cell = self.cells[self.cellOf[i]]
+        last = cell.pop()
+        if last != i:
+            cell[self.slot[i]] = last
+            self.slot[last] = self.slot[i]
+        self.count -= 1
+
+    # (px, py) 가 들어가는 칸의 열, 행
+    def cellPosition(self, px, py):
+        column = min(max(int((px - self.minX) / self.cellSize), 0), self.columns - 1)
+        row = min(max(int((py - self.minY) / self.cellSize), 0), self.rows - 1)
+        return column, row
+
+    # 중심 칸에서 r 칸 떨어진 고리 위의 칸들
+    def ring(self, column, row, r):
+        if r == 0:
+            yield row * self.columns + column
+            return
+        for dx in range(-r, r + 1):
+            c = column + dx
+            if 0 <= c < self.columns:
+                if row - r >= 0:
+                    yield (row - r) * self.columns + c
+                if row + r < self.rows:
+                    yield (row + r) * self.columns + c
+        for dy in range(-r + 1, r):
+            rr = row + dy
+            if 0 <= rr < self.rows:
+                if column - r >= 0:
+                    yield rr * self.columns + column - r
+                if column + r < self.columns:
+                    yield rr * self.columns + column + r
+
+    # 남은 도시 중 (px, py) 에서 가장 가까운 도시 index (없으면 -1)
+    def nearest(self, px, py):
+        found = self.nearestK(px, py, 1)
+        return found[0] if found else -1
+
+    # 남은 도시 중 (px, py) 에서 가까운 k 개 도시 index (가까운 순)
+    def nearestK(self, px, py, k):
+        k = min(k, self.count)
+        if k <= 0:
+            return []
+        column, row = self.cellPosition(px, py)
+        x, y = self.x, self.y
+        candidates = []
+        maxRing = max(self.columns, self.rows)
+        for r in range(0, maxRing + 1):
+            for cell in self.ring(column, row, r):
+                for i in self.cells[cell]:
+                    candidates.append((math.hypot(x[i] - px, y[i] - py), i))
+            # r 고리까지 보면 r * cellSize 안의 도시는 모두 찾은 것
+            if len(candidates) >= k:
+                candidates.sort()
+                if candidates[k - 1][0] <= r * self.cellSize:
+                    break
+        candidates.sort()
+        return [i for d, i in candidates[:k]]
+
+    # 가까운 k 개를 찾아서 지우기
+    def popNearestK(self, px, py, k):
+        found = self.nearestK(px, py, k)
+        for i in found:
+            self.remove(i)
+        return found
+
+    # 도시마다 자기 자신을 뺀 가까운 k 개 도시 index (n x k, 가까운 순)
+    # 칸 단위로 주변 칸 도시와의 거리를 한 번에 계산한다
+    def neighbors(self, k):
+        n = len(self.x)
+        k = max(min(k, n - 1), 0)
+        result = np.empty((n, k), dtype=np.int32)
+        if k == 0:
+            return result
+        xy = np.column_stack([self.x, self.y])
+        for cell in range(len(self.cells)):
+            members = self.cells[cell]
+            if not members:
+                continue
+            column, row = cell % self.columns, cell // self.columns
+            members = np.array(members)
+            candidates = list(self.cells[cell])
+            r = 0
+            while True:
+                r += 1
+                for other in self.ring(column, row, r):
+                    candidates.extend(self.cells[other])
+                if len(candidates) <= k and r <= max(self.columns, self.rows):
+                    continue
+                candidateArray = np.array(candidates)
+                diff = xy[members, None, :] - xy[None, candidateArray, :]
+                distance = np.hypot(diff[..., 0], diff[..., 1])
+                distance[members[:, None] == candidateArray[None, :]] = np.inf
+                nearest = np.argpartition(distance, k - 1, axis=1)[:, :k]
+                nearestDistance = np.take_along_axis(distance, nearest, axis=1)
+                if nearestDistance.max() <= r * self.cellSize or r > max(self.columns, self.rows):
+                    break
+            orderInRow = np.argsort(nearestDistance, axis=1, kind='stable')
+            result[members] = candidateArray[np.take_along_axis(nearest, orderInRow, axis=1)]
+        return result
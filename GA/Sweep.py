@@ -0,0 +1,115 @@
+# 유전 알고리즘 설정 격자 탐색
+# selection x crossover x mutation x mutationRate x population x init x seed 조합을 프로세스 풀에서 돌리고
+# 조합마다 가장 좋은 길이, 걸린 시간, CPU 시간을 CSV 표로 저장 (가장 좋은 길이 순)
+# 예: python Sweep.py --crossover order pmx cycle --mutation-rate 0.01 0.05 0.1 --seeds 1 2 3
+
+import csv
+import time
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from City import Population
+from Seeding import parseMix
+from CityStore import loadTourManager
+from GA_Random import GA
+from Cli import baseParser
+from Cli import parseArgs
+from Cli import seedAll
+from Cli import matrixDtype
+
+# 표의 열 순서
+COLUMNS = ['selection', 'crossover', 'mutation', 'mutation_rate', 'population', 'init', 'seed', 'n_generations',
+           'best', 'seconds', 'cpu_seconds']
+
+# 워커 프로세스마다 (도시 파일, 도시 수) -> tourmanager, 같은 인스턴스는 거리 행렬을 한 번만 만든다
+tourmanagers = {}
+
+
+def getTourManager(cities, n_cities, dtype=np.float64):
+    key = (cities, n_cities, dtype)
+    if key not in tourmanagers:
+        tourmanager = loadTourManager(cities, n_cities, dtype)
+        if tourmanager.useMatrix():
+            tourmanager.buildDistanceMatrix()
+        tourmanagers[key] = tourmanager
+    return tourmanagers[key]
+
+
+# 옵션 이름 -> 값 리스트 를 조합 dict 리스트로
+def grid(options):
+    names = list(options)
+    return [dict(zip(names, values)) for values in itertools.product(*[options[name] for name in names])]
+
+
+# 조합 하나 실행 (워커 프로세스), setting 에 결과 열을 더해서 리턴
+def runSetting(setting):
+    tourmanager = getTourManager(setting['cities'], setting['n_cities'], setting['dtype'])
+    seedAll(setting['seed'])
+
+    started = time.perf_counter()
+    cpuStarted = time.process_time()
+    pop = Population(tourmanager, setting['population'], False)
+    if setting['init'] == 'random':
+        pop.randomize()
+    else:
+        pop.seed(parseMix(setting['init']))
+    ga = GA(tourmanager, mutationRate=setting['mutation_rate'], selection=setting['selection'],
+            crossover=setting['crossover'], mutation=setting['mutation'])
+    for i in range(setting['n_generations']):
+        pop = ga.evolvePopulation(pop)
+
+    result = dict(setting)
+    result['best'] = pop.getFittest().getDistance()
+    result['seconds'] = time.perf_counter() - started
+    result['cpu_seconds'] = time.process_time() - cpuStarted
+    return result
+
+
+def sweep(settings, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(runSetting, settings))
+    return sorted(results, key=lambda result: result['best'])
+
+
+def writeTable(path, results):
+    with open(path, mode='w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+
+
+# 파일 직접 실행시 실행
+if __name__ == '__main__':
+    parser = baseParser('Parameter sweep for the genetic algorithm', 'sweep.csv', single=False)
+    parser.add_argument('--selection', nargs='+', default=['roulette'], choices=sorted(GA.SELECTIONS))
+    parser.add_argument('--crossover', nargs='+', default=['order'], choices=sorted(GA.CROSSOVERS))
+    parser.add_argument('--mutation', nargs='+', default=['swap'], choices=sorted(GA.MUTATIONS))
+    parser.add_argument('--mutation-rate', dest='mutation_rate', nargs='+', type=float, default=[0.1])
+    parser.add_argument('--population', nargs='+', type=int, default=[10])
+    parser.add_argument('--init', nargs='+', default=['random'],
+                        help='seeding mixes such as greedy=1,nearest=4 ("random" for all random tours)')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0])
+    parser.add_argument('--generations', dest='n_generations', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parseArgs(parser)
+
+    settings = grid({
+        'selection': args.selection,
+        'crossover': args.crossover,
+        'mutation': args.mutation,
+        'mutation_rate': args.mutation_rate,
+        'population': args.population,
+        'init': args.init,
+        'seed': args.seeds,
+    })
+    for setting in settings:
+        setting.update(cities=args.cities, n_cities=args.n_cities, n_generations=args.n_generations,
+                       dtype=matrixDtype(args))
+
+    results = sweep(settings, args.workers)
+    writeTable(args.output, results)
+    for result in results:
+        print('%-10s %-10s %-9s %6.3f %5d %-20s %5d  best %10.2f  cpu %7.2fs' % (
+            result['selection'], result['crossover'], result['mutation'], result['mutation_rate'],
+            result['population'], result['init'], result['seed'], result['best'], result['cpu_seconds']))
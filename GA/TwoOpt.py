@@ -0,0 +1,133 @@
+import math
+from collections import deque
+import numpy as np
+from Neighbor import nearestNeighbors
+
+# 이 값보다 작은 개선은 무시 (부동소수점 오차로 같은 이동을 반복하지 않도록)
+EPSILON = 1e-9
+
+
+# 2-opt 지역 탐색
+# 후보는 k 최근접 이웃만, don't-look bit(큐에 없는 도시)는 건너뛰고,
+# 이득은 바뀌는 간선 2개로만 계산한다
+class TwoOpt:
+    def __init__(self, coordinates, neighbors=8, neighborList=None):
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        self.x = coordinates[:, 0].tolist()
+        self.y = coordinates[:, 1].tolist()
+        if neighborList is None:
+            neighborList = nearestNeighbors(coordinates, neighbors)
+        self.neighbors = np.asarray(neighborList).tolist()
+
+    def distance(self, a, b):
+        return math.hypot(self.x[a] - self.x[b], self.y[a] - self.y[b])
+
+    # 도시 index 순서(order)를 개선해서 (새 순서, 줄어든 길이) 리턴
+    # 첫 도시는 계속 맨 앞, active 를 주면 그 도시들만 처음에 탐색한다
+    def optimize(self, order, active=None):
+        order = np.asarray(order).tolist()
+        size = len(order)
+        if size < 5:
+            return np.array(order, dtype=np.int32), 0.0
+
+        first = order[0]
+        position = [-1] * len(self.x)
+        for i in range(size):
+            position[order[i]] = i
+
+        x, y, neighbors = self.x, self.y, self.neighbors
+        totalGain = 0.0
+        # active 가 없으면 큐가 빌 때 다른 도시 이동으로 새로 생긴 개선을 찾으려고 전체를 한 번 더 본다
+        queue = deque(order if active is None else active)
+        inQueue = [False] * len(self.x)
+        for city in queue:
+            inQueue[city] = True
+        passGain = 0.0
+        while queue or (active is None and passGain > 0):
+            if not queue:
+                queue.extend(order)
+                for city in order:
+                    inQueue[city] = True
+                passGain = 0.0
+            a = queue.popleft()
+            inQueue[a] = False
+            posA = position[a]
+            if posA < 0:
+                continue
+            succA = order[(posA + 1) % size]
+            predA = order[posA - 1]
+            dSucc = math.hypot(x[a] - x[succA], y[a] - y[succA])
+            dPred = math.hypot(x[a] - x[predA], y[a] - y[predA])
+
+            move = None
+            for c in neighbors[a]:
+                posC = position[c]
+                if posC < 0:
+                    continue
+                dAC = math.hypot(x[a] - x[c], y[a] - y[c])
+                if dAC >= dSucc and dAC >= dPred:
+                    break
+                # a-succA, c-succC 를 a-c, succA-succC 로
+                if dAC < dSucc:
+                    succC = order[(posC + 1) % size]
+                    if c != succA and succC != a:
+                        gain = dSucc + math.hypot(x[c] - x[succC], y[c] - y[succC]) - dAC \
+                            - math.hypot(x[succA] - x[succC], y[succA] - y[succC])
+                        if gain > EPSILON:
+                            move = (posA + 1, posC, gain, (a, succA, c, succC))
+                            break
+                # predA-a, predC-c 를 a-c, predA-predC 로
+                if dAC < dPred:
+                    predC = order[posC - 1]
+                    if c != predA and predC != a:
+                        gain = dPred + math.hypot(x[c] - x[predC], y[c] - y[predC]) - dAC \
+                            - math.hypot(x[predA] - x[predC], y[predA] - y[predC])
+                        if gain > EPSILON:
+                            move = (posC, posA - 1, gain, (a, predA, c, predC))
+                            break
+
+            if move is not None:
+                self.reverse(order, position, move[0] % size, move[1] % size)
+                totalGain += move[2]
+                passGain += move[2]
+                for city in move[3]:
+                    if not inQueue[city]:
+                        inQueue[city] = True
+                        queue.append(city)
+
+        start = position[first]
+        order = order[start:] + order[:start]
+        return np.array(order, dtype=np.int32), totalGain
+
+    # i 부터 j 까지(앞 방향, 원형) 뒤집기, 더 짧은 쪽을 뒤집는다
+    def reverse(self, order, position, i, j):
+        size = len(order)
+        length = (j - i) % size + 1
+        if 2 * length > size:
+            i, j = (j + 1) % size, (i - 1) % size
+            length = size - length
+        for _ in range(length // 2):
+            ci = order[i]
+            cj = order[j]
+            order[i] = cj
+            position[cj] = i
+            order[j] = ci
+            position[ci] = j
+            i = (i + 1) % size
+            j = (j - 1) % size
+
+    # City.Tour 를 제자리에서 개선 (거리는 다음 evaluate 때 다시 계산)
+    def improveTour(self, tour):
+        order, gain = self.optimize(tour.getOrder())
+        if gain > 0:
+            tour.setOrder(order)
+        return tour
+
+
+# City 리스트(닫힌 여행)를 2-opt 로 개선한 새 리스트
+def improveCities(cities, neighbors=8):
+    if len(cities) < 5:
+        return list(cities)
+    coordinates = [[float(city.x), float(city.y)] for city in cities]
+    order, gain = TwoOpt(coordinates, neighbors).optimize(range(len(cities)))
+    return [cities[i] for i in order]
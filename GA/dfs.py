@@ -1,11 +1,20 @@
 import random
+from OrOpt import improveCities
+from Spatial import GridIndex
+from ClusterOrder import ClusterOrder
 
 
 
 # 최종 도시들의 정렬이 담긴 클래스
 class tour:
-    def __init__(self, cities_array, cluster_number):
+    # tourmanager 가 있으면 도시 index 로 거리 행렬을 조회한다
+    # orOpt 면 군집을 만든 뒤 Or-opt 로 군집 경로를 다듬는다
+    # index 는 cities_array 좌표로 만든 GridIndex (여러 tour 가 같이 쓰면 미리 만들어 넘긴다)
+    def __init__(self, cities_array, cluster_number, tourmanager=None, orOpt=True, index=None):
         self.cities = cities_array
+        self.tourmanager = tourmanager
+        self.orOpt = orOpt
+        self.index = index
         self.total_length = 0
         self.cities_order = []
         self.cluster_number = cluster_number
@@ -16,102 +25,86 @@ class tour:
     def getArray(self):
         return self.cities_order
 
+    # 도시 사이 거리
+    def getDistance(self, pre_city, post_city):
+        if self.tourmanager is not None:
+            return self.tourmanager.getDistance(pre_city.index, post_city.index)
+        return pre_city.getDistance(post_city)
+
     def getArray2(self, start, end):
         tmp = []
         for i in range(0, (end-start+1)):
             tmp.append(self.cities_order[(start+i)])
         return tmp
 
+    # 격자 색인에서 시작 도시에 가까운 도시를 꺼내 군집을 만든다
+    # 나머지 도시는 앞쪽 군집에 하나씩 더 넣어 모든 도시가 들어가게 한다
     def createClusters(self, cities, cluster_number):
-        cluster_size = len(cities) // cluster_number
-        # cluster 분할을 위한 copy_cities를 생성
-        copy_cities = cities.copy()
+        if self.index is None:
+            index = GridIndex([[float(city.x), float(city.y)] for city in cities])
+        else:
+            index = self.index.copy()
+        # 시작 도시 후보, 뽑은 도시는 마지막 도시와 자리를 바꿔 O(1) 로 뺀다
+        remaining = list(range(1, len(cities)))
 
-        next_index = 0
         for i in range(cluster_number):
-
             if i == 0:  # 첫번째 클러스터의 시작은 start_node
-                self.cluster_array.append(cluster(copy_cities[next_index]))
-                del copy_cities[next_index]
+                next_index = 0
             else:  # 두번째 클러스터부터는 시작값을 랜덤으로 뽑는다.
-                next_index = random.randint(0, len(copy_cities) - 1)
-                self.cluster_array.append(cluster(copy_cities[next_index]))
-                del copy_cities[next_index]
+                pick = random.randint(0, len(remaining) - 1)
+                next_index = remaining[pick]
+                remaining[pick] = remaining[-1]
+                remaining.pop()
+            self.cluster_array.append(cluster(cities[next_index], self.tourmanager))
+            index.remove(next_index)
 
         for i in range(cluster_number):
-            # 클러스터의 사이즈 만큼 각 클러스터 시작노드로부터 greedy를 통해 뽑는다
+            cluster_size = len(cities) // cluster_number
+            if i < len(cities) % cluster_number:
+                cluster_size += 1
+            # 클러스터의 사이즈 만큼 각 클러스터 시작노드로부터 가까운 도시를 greedy 로 뽑는다
             current_node = self.cluster_array[i].start_node
-            for j in range(cluster_size - 1):
-                min_distance = 1000000
-                nearest_city = current_node
-                nearest_city_index = 0
-                for k in range(len(copy_cities)):
-                    # 현재의 노드로부터 각각의 노드와의 거리비교에서 작은값도출
-                    if current_node.getDistance(copy_cities[k]) < min_distance:
-                        min_distance = current_node.getDistance(copy_cities[k])
-                        nearest_city = copy_cities[k]
-                        nearest_city_index = k
-                self.cluster_array[i].inputCity(nearest_city)
-                del copy_cities[nearest_city_index]
+            for k in index.popNearestK(float(current_node.x), float(current_node.y), cluster_size - 1):
+                self.cluster_array[i].inputCity(cities[k])
+            if self.orOpt:
+                self.cluster_array[i].optimize()
             print(len(self.cluster_array[i].cities_order))
             print(self.cluster_array[i].start_node.index)
             print(self.cluster_array[i].end_node.index)
-        print(len(copy_cities))
+        print(len(index))
 
+    # 군집 순서와 방향을 정해 연결 (군집이 적으면 Held-Karp, 많으면 최근접 이웃 + 2-opt)
     def bindClusters(self):
-        visited = [-1] * self.cluster_number
-        length, array = self.dfsSearch(visited, 0, 0, self.cluster_array)
+        starts = [[float(c.start_node.x), float(c.start_node.y)] for c in self.cluster_array]
+        ends = [[float(c.end_node.x), float(c.end_node.y)] for c in self.cluster_array]
+        sequence, length = ClusterOrder(starts, ends).solve()
         temp_array = []
         for i in range(self.cluster_number):
-            self.total_length = self.total_length + self.cluster_array[i].length
-            temp_array.append(self.cluster_array[array[i]])
-            print(array[i])
-        self.total_length = self.total_length + length
+            cluster_index, reverse = sequence[i]
+            if reverse:
+                self.cluster_array[cluster_index].reverse()
+            temp_array.append(self.cluster_array[cluster_index])
+            self.total_length = self.total_length + temp_array[i].length
+            if i > 0:
+                self.total_length = self.total_length + temp_array[i - 1].connectClusters(temp_array[i])
+            print(cluster_index)
         self.cluster_array = temp_array.copy()
         self.createCitiesOrder(self.cities, self.cluster_number)
         print(self.total_length)
 
-    # 주어진 cluster들을 dfs기법을 기반으로 연결하여 최적의 코드를 얻는다.
-    def dfsSearch(self, visited, depth, total_length, cluster_array):
-
-        if depth == len(cluster_array):
-            return total_length, visited
-
-        min_distance = 10000000
-        min_array = []
-
-        for node in range(len(cluster_array)):
-            if node not in visited:
-                print("depth", depth)
-                print("node", node)
-                if depth == 0 and node != 0:
-                    # 시작은 항상 0번째 부터이기에 이후는 필요가 없다.
-                    print("check")
-                    break
-                else:
-                    total_length = total_length + cluster_array[visited[depth - 1]].connectClusters(
-                        cluster_array[visited[depth]])
-                visited[depth] = node
-                distance, array = self.dfsSearch(visited, depth + 1, total_length, cluster_array)
-                if distance < min_distance:
-                    min_distance = distance
-                    min_array = array.copy()
-                visited[depth] = -1
-
-        return total_length, min_array
-
     def createCitiesOrder(self, cities, cluster_number):
         for i in range(cluster_number):
             for j in range(len(self.cluster_array[i].cities_order)):
                 self.cities_order.append(self.cluster_array[i].cities_order[j])
         self.cities_order.append(cities[0])
-        self.total_length = self.total_length + self.cities_order[len(self.cities_order) - 2].getDistance(
-            self.cities_order[len(self.cities_order) - 1])
+        self.total_length = self.total_length + self.getDistance(
+            self.cities_order[len(self.cities_order) - 2], self.cities_order[len(self.cities_order) - 1])
 
 
 # 각 군집을 담는 클래스
 class cluster:
-    def __init__(self, start_node):
+    def __init__(self, start_node, tourmanager=None):
+        self.tourmanager = tourmanager
         self.cities_order = []
         self.start_node = start_node
         self.end_node = start_node
@@ -121,15 +114,35 @@ class cluster:
     # cluster에 받은 도시를 삽입후 총 길이 갱신(greedy로만으로 cluster를 만들시 사용하기위해서)
     def inputCity(self, city):
         self.cities_order.append(city)
-        self.length = self.length + self.cities_order[len(self.cities_order) - 2].getDistance(
-            self.cities_order[len(self.cities_order) - 1])
+        self.length = self.length + self.getDistance(
+            self.cities_order[len(self.cities_order) - 2], self.cities_order[len(self.cities_order) - 1])
+        self.defineEndNode()
+
+    # 도시 사이 거리
+    def getDistance(self, pre_city, post_city):
+        if self.tourmanager is not None:
+            return self.tourmanager.getDistance(pre_city.index, post_city.index)
+        return pre_city.getDistance(post_city)
+
+    # 시작, 끝 도시는 그대로 두고 Or-opt 로 경로를 다듬은 뒤 길이 다시 계산
+    def optimize(self):
+        self.cities_order = improveCities(self.cities_order, closed=False)
+        self.length = 0
+        for j in range(1, len(self.cities_order)):
+            self.length = self.length + self.getDistance(self.cities_order[j - 1], self.cities_order[j])
+        self.defineEndNode()
+
+    # 경로 방향 뒤집기 (시작, 끝 도시가 바뀐다)
+    def reverse(self):
+        self.cities_order.reverse()
+        self.start_node = self.cities_order[0]
         self.defineEndNode()
 
     def defineEndNode(self):
         self.end_node = self.cities_order[len(self.cities_order) - 1]
 
     def connectClusters(self, post_claster):
-        return self.end_node.getDistance(post_claster.start_node)
+        return self.getDistance(self.end_node, post_claster.start_node)
 
 
 
@@ -1,11 +1,15 @@
 import math
+import os
 import random
-import cv2
 import csv
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.cluster import KMeans
-import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from TwoOpt import TwoOpt
+from OrOpt import OrOpt
+from CityStore import loadCoordinates
+from Checkpoint import saveCheckpoint
+from Checkpoint import loadCheckpoint
+from Plot import showTour
 
 # TSP 도시 생성 클래스
 class City:
@@ -59,34 +63,32 @@ class TourManager:
         return len(self.destinationCities)
 
 class KClustering:
-    def cluster(self, k, tourmanager):
-        df = pd.read_csv('TSP.csv', names=['x', 'y'])
-        data = df[['x', 'y']]
+    # 좌표 (n x 2) 를 정규화해서 k 개 군집으로 나누고 도시마다 군집 번호 리턴
+    def labels(self, k, coordinates):
+        # sklearn 은 군집을 나눌 때만 불러온다
+        from sklearn.preprocessing import MinMaxScaler
+        from sklearn.cluster import KMeans
 
         scaler = MinMaxScaler()
-        data_scale = scaler.fit_transform(data)
-        # k = 4
+        data_scale = scaler.fit_transform(coordinates)
 
         # 그룹 수, random_state 설정
         model = KMeans(n_clusters=k, random_state=10)
 
-        # 정규화된 데이터에 학습
-        model.fit(data_scale)
+        # 정규화된 데이터에 학습, 각 데이터가 몇 번째 그룹에 속하는지 리턴
+        return model.fit_predict(data_scale)
 
-        # 클러스터링 결과 각 데이터가 몇 번째 그룹에 속하는지 저장
-        df["cluster"] = model.fit_predict(data_scale)
+    def cluster(self, k, tourmanager):
+        # tourmanager 의 도시 좌표로 군집을 나눈다 (TSP.csv 를 다시 읽지 않음)
+        coordinates = np.array([[city.x, city.y] for city in tourmanager.destinationCities], dtype=np.float64)
 
-        for i in range(k):
-            plt.scatter(df.loc[df['cluster'] == i, 'x'], df.loc[df['cluster'] == i, 'y'],
-                        label='cluster' + str(i), s=10)
-        plt.xlabel('X', size=12)
-        plt.ylabel('Y', size=12)
-        #plt.show()
+        # 클러스터링 결과 각 데이터가 몇 번째 그룹에 속하는지 저장
+        labels = self.labels(k, coordinates)
 
         cities_of_cluster = []
         idxs_list = []
         for i in range(0, k):
-            tmp = [cities for cities in df[df['cluster'] == i].index]
+            tmp = np.flatnonzero(labels == i).tolist()
             idxs_list.append(tmp)
             tmp_list = []
             for k in tmp:
@@ -218,19 +220,28 @@ class Population:
 
 
 # 유전 알고리즘 클래스
+# localSearch: None, 'elite'(엘리트만), 'child'(모든 자식) 에 2-opt 지역 탐색 적용
 class GA:
-    def __init__(self, tourmanager, mutationRate=0.05, tournamentSize=5, elitism=True):
+    def __init__(self, tourmanager, mutationRate=0.05, tournamentSize=5, elitism=True, localSearch=None):
         self.tourmanager = tourmanager
         self.mutationRate = mutationRate
         self.tournamentSize = tournamentSize
         self.elitism = elitism
+        self.localSearch = localSearch
+        # 지역 탐색 엔진과 도시 -> 엔진 index 표는 GA 마다 한 번만 만든다
+        self.twoOpt = None
+        self.orOpt = None
+        self.cityIndex = None
 
     # 인구 클래스 진화 과정
     def evolvePopulation(self, pop):
         newPopulation = Population(self.tourmanager, pop.populationSize(), False)
         elitismOffset = 0
         if self.elitism:
-            newPopulation.saveTour(0, pop.getFittest())
+            elite = pop.getFittest()
+            if self.localSearch == 'elite':
+                elite = self.improve(Tour(self.tourmanager, list(elite.tour)))
+            newPopulation.saveTour(0, elite)
             elitismOffset = 1
 
         for i in range(elitismOffset, newPopulation.populationSize()):
@@ -242,8 +253,54 @@ class GA:
         for i in range(elitismOffset, newPopulation.populationSize()):
             self.mutate(newPopulation.getTour(i))
 
+        if self.localSearch == 'child':
+            for i in range(elitismOffset, newPopulation.populationSize()):
+                self.improve(newPopulation.getTour(i))
+
         return newPopulation
 
+    # tourmanager 도시 좌표 (n x 2), 엔진은 destinationCities 위치를 도시 index 로 쓴다
+    def coordinates(self):
+        return [[float(city.x), float(city.y)] for city in self.tourmanager.destinationCities]
+
+    def getTwoOpt(self):
+        if self.twoOpt is None:
+            self.twoOpt = TwoOpt(self.coordinates())
+        return self.twoOpt
+
+    def getOrOpt(self):
+        if self.orOpt is None:
+            self.orOpt = OrOpt(self.coordinates())
+        return self.orOpt
+
+    # 여행의 City 리스트 -> 엔진 index 리스트
+    def engineOrder(self, tour):
+        if self.cityIndex is None:
+            self.cityIndex = {id(city): i for i, city in enumerate(self.tourmanager.destinationCities)}
+        return [self.cityIndex[id(city)] for city in tour.tour]
+
+    # 엔진이 줄인 순서로 여행 바꾸기 (줄지 않았으면 그대로)
+    def applyOrder(self, tour, order, gain):
+        if gain > 0:
+            tour.tour = [self.tourmanager.getCity(i) for i in order]
+            tour.fitness = 0.0
+            tour.distance = 0
+        return tour
+
+    # 2-opt 로 여행 개선
+    def improve(self, tour):
+        if tour.tourSize() < 5:
+            return tour
+        order, gain = self.getTwoOpt().optimize(self.engineOrder(tour))
+        return self.applyOrder(tour, order.tolist(), gain)
+
+    # Or-opt 로 잘못 놓인 도시 1 ~ 3 개 구간 옮기기
+    def polish(self, tour):
+        if tour.tourSize() < 4:
+            return tour
+        order, gain = self.getOrOpt().optimize(self.engineOrder(tour), True)
+        return self.applyOrder(tour, np.asarray(order).tolist(), gain)
+
     def crossover(self, parent1, parent2):
         child = Tour(self.tourmanager)
 
@@ -286,31 +343,88 @@ class GA:
         fittest = tournament.getFittest()
         return fittest
 
+# 군집별 인구를 (군집 안 도시 index) 배열로 바꿔 checkpoint 에 저장
+def saveClusterCheckpoint(path, pops, tourmanagers, generation):
+    orders = []
+    lengths = []
+    for pop, tourmanager in zip(pops, tourmanagers):
+        position = {}
+        for i in range(tourmanager.numberOfCities()):
+            position[id(tourmanager.getCity(i))] = i
+        orders.append(np.array([[position[id(city)] for city in tour.tour] for tour in pop.tours], dtype=np.int32))
+        lengths.append(np.array([tour.distance for tour in pop.tours], dtype=np.float64))
+    saveCheckpoint(path, orders, lengths, generation)
+
+
+# checkpoint 에서 군집별 인구 복원 (난수 상태도 되돌림), 리턴은 (인구 리스트, 다음 세대 번호)
+def loadClusterCheckpoint(path, tourmanagers):
+    orders, lengths, generation = loadCheckpoint(path)
+    pops = []
+    for block, distances, tourmanager in zip(orders, lengths, tourmanagers):
+        pop = Population(tourmanager, len(block), False)
+        for i, (order, distance) in enumerate(zip(block.tolist(), distances.tolist())):
+            tour = Tour(tourmanager, [tourmanager.getCity(c) for c in order])
+            tour.distance = distance
+            pop.saveTour(i, tour)
+        pops.append(pop)
+    return pops, generation
+
+
+# 군집 하나를 (worker 프로세스에서) 진화시키고 가장 좋은 여행만 돌려준다
+# coordinates 는 군집 도시 좌표 리스트, 리턴은 (군집 안 도시 index 순서, 거리)
+# checkpoint 를 주면 checkpointInterval 세대마다 저장하고, 파일이 있으면 그 세대부터 이어서 실행
+def solveCluster(coordinates, populationSize, n_generations, seed=None, localSearch=None,
+                 checkpoint=None, checkpointInterval=10):
+    if seed is not None:
+        random.seed(seed)
+    tourmanager = TourManager()
+    for x, y in coordinates:
+        tourmanager.addCity(City(x=x, y=y))
+
+    start = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        pops, start = loadClusterCheckpoint(checkpoint, [tourmanager])
+        pop = pops[0]
+    else:
+        pop = Population(tourmanager, populationSize=populationSize, initialise=True)
+    ga = GA(tourmanager, localSearch=localSearch)
+    for i in range(start, n_generations):
+        pop = ga.evolvePopulation(pop)
+        if checkpoint is not None and (i + 1) % checkpointInterval == 0:
+            saveClusterCheckpoint(checkpoint, [pop], [tourmanager], i + 1)
+
+    # 마지막 세대의 가장 좋은 여행은 Or-opt 로 다듬는다
+    fittest = ga.polish(pop.getFittest())
+    position = {}
+    for i in range(tourmanager.numberOfCities()):
+        position[id(tourmanager.getCity(i))] = i
+    return [position[id(city)] for city in fittest.tour], fittest.getDistance()
+
+
+# 군집들을 프로세스 풀에서 나눠 풀기, 군집 순서대로 solveCluster 결과 리스트
+# checkpoint 를 주면 군집 i 는 checkpoint.i 파일에 따로 저장
+def solveClusters(cluster_coordinates, population_size, n_generations, workers=None, seed=None, localSearch=None,
+                  checkpoint=None):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for i in range(len(cluster_coordinates)):
+            clusterSeed = None if seed is None else seed + i
+            clusterCheckpoint = None if checkpoint is None else '%s.%d' % (checkpoint, i)
+            futures.append(executor.submit(solveCluster, cluster_coordinates[i], population_size[i],
+                                           n_generations, clusterSeed, localSearch, clusterCheckpoint))
+        return [future.result() for future in futures]
+
 # 파일 직접 실행시 실행
 if __name__ == '__main__':
-    f = open('TSP.csv', 'r')
-    reader = csv.reader(f)
     n_cities = 1000
 
     n_generations = 10
-    cityCoordinate = []
-    city_x = []
-    city_y = []
-
-    for line in reader:
-        line0 = float(line[0])
-        line1 = float(line[1])
-        city = [line0, line1]
-        cityCoordinate.append(city)
-        city_x.append(line0)
-        city_y.append(line1)
-        if len(cityCoordinate) == n_cities:
-            break
-    f.close()
 
+    # 좌표는 CityStore 캐시에서 읽는다
+    coordinates = loadCoordinates('TSP.csv', n_cities)
     tourmanager = TourManager()
-    for i in range(n_cities):
-        tourmanager.addCity(City(x=city_x[i], y=city_y[i]))
+    for x, y in coordinates.tolist():
+        tourmanager.addCity(City(x=x, y=y))
 
     clustering = KClustering()
     k = 70
@@ -355,33 +469,63 @@ if __name__ == '__main__':
     # cv2.imshow('map', map_original)
     # cv2.waitKey(0)
 
-    # Initialize population
-    pop = []
-    for i in range(0, k):
-        pop.append(Population(tourmanagerList[i], populationSize=population_size[i], initialise=True))
-        print("Initial distance: " + str(pop[i].getFittest().getDistance()))
-        print(tourmanagerList[i].numberOfCities())
+    # 군집끼리 공유하는 상태가 없으므로 parallel 이면 프로세스 풀에서 동시에 푼다
+    parallel = True
+    workers = os.cpu_count()
 
-    # Evolve population
-    ga = []
-    for i in range(0, k):
-        ga.append(GA(tourmanagerList[i]))
+    # TSP_CHECKPOINT 에 파일 경로를 주면 checkpoint_interval 세대마다 진화 상태 저장
+    checkpoint = os.environ.get('TSP_CHECKPOINT')
+    checkpoint_interval = 10
 
-    colors = ["blue", "red", "green", "yellow", "blue", "red", "green", "yellow", "black", "grey"]
-    for i in range(n_generations):
-        for j in range(0, k):
-        # population에 대해 유전알고리즘 시행 후 다시 저장
-            pop[j] = ga[j].evolvePopulation(pop[j])
+    fittest_list = []
+    if parallel:
+        cluster_coordinates = []
+        for i in range(0, k):
+            cluster_coordinates.append([(city.x, city.y) for city in cluster_cities[i]])
+        results = solveClusters(cluster_coordinates, population_size, n_generations, workers,
+                                checkpoint=checkpoint)
+        for i in range(0, k):
+            order, distance = results[i]
+            fittest_list.append(Tour(tourmanagerList[i], [tourmanagerList[i].getCity(c) for c in order]))
+    else:
+        # Initialize population
+        pop = []
+        for i in range(0, k):
+            pop.append(Population(tourmanagerList[i], populationSize=population_size[i], initialise=True))
+            print("Initial distance: " + str(pop[i].getFittest().getDistance()))
+            print(tourmanagerList[i].numberOfCities())
 
-            # 가장 적합도가 높은 여행
-            fittest = pop[j].getFittest()
+        # Evolve population
+        ga = []
+        for i in range(0, k):
+            ga.append(GA(tourmanagerList[i]))
+
+        # checkpoint 가 있으면 저장된 세대부터 이어서 실행
+        start = 0
+        if checkpoint is not None and os.path.exists(checkpoint):
+            pop, start = loadClusterCheckpoint(checkpoint, tourmanagerList)
 
-            if i == n_generations - 1:
-                for m in range(1, population_size[j]):
-                    plt.plot([fittest[m].x, fittest[m - 1].x], [fittest[m].y, fittest[m - 1].y], linewidth="0.5")
+        for i in range(start, n_generations):
+            for j in range(0, k):
+            # population에 대해 유전알고리즘 시행 후 다시 저장
+                pop[j] = ga[j].evolvePopulation(pop[j])
+            if checkpoint is not None and (i + 1) % checkpoint_interval == 0:
+                saveClusterCheckpoint(checkpoint, pop, tourmanagerList, i + 1)
+
+        for j in range(0, k):
+            # 마지막 세대의 가장 좋은 여행은 Or-opt 로 다듬는다
+            fittest_list.append(ga[j].polish(pop[j].getFittest()))
+
+    # 군집마다 가장 좋은 경로를 전체 도시 index 로 바꿔 LineCollection 하나로 그린다
+    cluster_labels = np.zeros(n_cities, dtype=np.int64)
+    cluster_orders = []
+    for j in range(0, k):
+        cluster_labels[idx_list[j]] = j
+        index_of = {id(city): idx for city, idx in zip(cluster_cities[j], idx_list[j])}
+        cluster_orders.append([index_of[id(city)] for city in fittest_list[j].tour])
     for i in range(0, k):
-        print(pop[i].getFittest())
-        print("Final distance: " + str(pop[i].getFittest().getDistance()))
+        print(fittest_list[i])
+        print("Final distance: " + str(fittest_list[i].getDistance()))
         # 지도에 반영
         # map_result = map_original.copy()
 
@@ -410,12 +554,12 @@ if __name__ == '__main__':
     print("Finished")
     sum = 0
     for i in range(0, k):
-        print("Final distance%d: %s" % (i+1, str(pop[i].getFittest().getDistance())))
+        print("Final distance%d: %s" % (i+1, str(fittest_list[i].getDistance())))
         print("%d Solution:" % (i+1))
-        print(pop[i].getFittest())
+        print(fittest_list[i])
         print()
-        sum += pop[i].getFittest().getDistance()
+        sum += fittest_list[i].getDistance()
     print(sum)
-    plt.show()
+    showTour(coordinates, cluster_orders, path='ga2.png', closed=False, cityColors=cluster_labels)
 
     # cv2.waitKey(0)
\ No newline at end of file
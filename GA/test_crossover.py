@@ -0,0 +1,68 @@
+# 교차 연산 결과가 올바른 순열인지 확인 (python -m pytest GA)
+# 부모는 도시 0 으로 시작하는 랜덤 여행, 구간 위치는 같은 seed 로 교차 연산이 뽑는 난수를 다시 뽑아 확인
+
+import random
+import numpy as np
+from City import City
+from City import TourManager
+from City import Population
+from GA_Random import GA
+
+
+def makeGA(n, seed):
+    rng = np.random.default_rng(seed)
+    tourmanager = TourManager()
+    for i, (x, y) in enumerate(rng.random((n, 2)).tolist()):
+        tourmanager.addCity(City(x, y, i))
+    pop = Population(tourmanager, 2, False).randomize(rng)
+    return GA(tourmanager), pop.getTour(0), pop.getTour(1)
+
+
+def isPermutation(order, n):
+    return sorted(np.asarray(order).tolist()) == list(range(n))
+
+
+def test_order_crossover():
+    for seed in range(50):
+        n = 5 + seed
+        ga, parent1, parent2 = makeGA(n, seed)
+        first = parent1.getOrder()
+
+        random.seed(seed)
+        startPos = random.randint(1, n - 1)
+        endPos = random.randint(startPos + 1, n)
+        random.seed(seed)
+        child = ga.orderCrossover(parent1, parent2).getOrder()
+
+        assert isPermutation(child, n)
+        assert child[0] == parent2.getOrder()[0]
+        assert (child[startPos:endPos+1] == first[startPos:endPos+1]).all()
+
+
+def test_pmx_crossover():
+    for seed in range(50):
+        n = 5 + seed
+        ga, parent1, parent2 = makeGA(n, seed)
+        first = parent1.getOrder()
+
+        random.seed(seed)
+        startPos = random.randint(1, n - 2)
+        endPos = random.randint(startPos + 1, n - 1)
+        random.seed(seed)
+        child = ga.PMXCrossover(parent1, parent2).getOrder()
+
+        assert isPermutation(child, n)
+        assert child[0] == parent2.getOrder()[0]
+        assert (child[startPos:endPos+1] == first[startPos:endPos+1]).all()
+
+
+def test_cycle_crossover():
+    for seed in range(50):
+        n = 5 + seed
+        ga, parent1, parent2 = makeGA(n, seed)
+        child = ga.cycleCrossover(parent1, parent2).getOrder()
+
+        assert isPermutation(child, n)
+        assert child[0] == parent2.getOrder()[0]
+        # 자리마다 두 부모 중 한쪽 도시
+        assert ((child == parent1.getOrder()) | (child == parent2.getOrder())).all()
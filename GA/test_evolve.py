@@ -0,0 +1,57 @@
+# evolvePopulation 한 번 동안의 여행 길이 계산 횟수 확인 (python -m pytest GA)
+# 순서 교차 자식은 길이 없이 넘어가 다음 evaluate 에서 한 번에 계산되고,
+# EAX 자식은 부모 길이 + 차이로 길이를 들고 와서 변이도 간선 차이로 갱신된다
+
+import random
+import numpy as np
+from City import City
+from City import TourManager
+from City import Population
+from City import EvaluationCounter
+from GA_Random import GA
+
+
+def makePopulation(n, size, seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    tourmanager = TourManager()
+    for i, (x, y) in enumerate(rng.random((n, 2)).tolist()):
+        tourmanager.addCity(City(x, y, i))
+    return tourmanager, Population(tourmanager, size, False).randomize(rng)
+
+
+def countEvolve(ga, pop):
+    evaluations, deltas = EvaluationCounter.snapshot()
+    newPopulation = ga.evolvePopulation(pop)
+    after = EvaluationCounter.snapshot()
+    return newPopulation, after[0] - evaluations, after[1] - deltas
+
+
+def test_order_children_evaluated_once():
+    tourmanager, pop = makePopulation(40, 10, 1)
+    ga = GA(tourmanager, mutationRate=0.2, crossover='order')
+    newPopulation, evaluations, deltas = countEvolve(ga, pop)
+
+    # 부모 세대는 randomize 에서 이미 계산, 자식은 길이가 없어서 변이도 간선 갱신을 하지 않는다
+    assert evaluations == 0
+    assert deltas == 0
+    before = EvaluationCounter.evaluations
+    newPopulation.evaluate()
+    # 엘리트는 길이를 그대로 가지고 있다
+    assert EvaluationCounter.evaluations - before == newPopulation.populationSize() - 1
+
+
+def test_eax_children_use_deltas():
+    tourmanager, pop = makePopulation(40, 10, 2)
+    ga = GA(tourmanager, mutationRate=0.2, crossover='eax')
+    newPopulation, evaluations, deltas = countEvolve(ga, pop)
+
+    assert evaluations == 0
+    # 자식마다 교차 차이 하나, 변이마다 하나 더
+    assert deltas > newPopulation.populationSize() - 1
+    before = EvaluationCounter.evaluations
+    lengths = newPopulation.evaluate()
+    assert EvaluationCounter.evaluations == before
+    for tour, length in zip(newPopulation.tours, lengths):
+        assert abs(tourmanager.tourLength(tour.getOrder()) - length) < 1e-9
@@ -0,0 +1,43 @@
+# 거리가 캐시된 여행에서 이동 연산 뒤 길이가 전체 다시 계산한 값과 같은지 확인 (python -m pytest GA)
+
+import numpy as np
+from City import City
+from City import TourManager
+from City import Population
+
+
+def makeTour(n, seed):
+    rng = np.random.default_rng(seed)
+    tourmanager = TourManager()
+    for i, (x, y) in enumerate(rng.random((n, 2)).tolist()):
+        tourmanager.addCity(City(x, y, i))
+    return tourmanager, Population(tourmanager, 1, False).randomize(rng).getTour(0)
+
+
+def test_move_city():
+    n = 12
+    for tourPos1 in range(n):
+        for tourPos2 in range(n):
+            tourmanager, tour = makeTour(n, tourPos1 * n + tourPos2)
+            before = tour.getOrder().tolist()
+            tour.getPositions()
+            tour.moveCity(tourPos1, tourPos2)
+
+            expected = before[:tourPos1] + before[tourPos1+1:]
+            expected.insert(tourPos2, before[tourPos1])
+            assert tour.getOrder().tolist() == expected
+            assert (tour.getPositions()[tour.getOrder()] == np.arange(n)).all()
+            assert abs(tour.distance - tourmanager.tourLength(tour.getOrder())) < 1e-9
+
+
+def test_swap_and_reverse():
+    n = 20
+    tourmanager, tour = makeTour(n, 0)
+    rng = np.random.default_rng(1)
+    for i in range(200):
+        a, b = sorted(rng.integers(0, n, 2).tolist())
+        if i % 2 == 0:
+            tour.swapCities(a, b)
+        else:
+            tour.reverseSegment(a, b)
+        assert abs(tour.distance - tourmanager.tourLength(tour.getOrder())) < 1e-9